@@ -0,0 +1,115 @@
+import time
+
+"""
+Wall clock driven timing for animations such as L{BlinkStick.morph}, L{BlinkStick.pulse}
+and L{BlinkStick.blink}.
+"""
+
+
+class Animation(object):
+    """
+    Timeline of an animation which lasts exactly the requested duration regardless of how long
+    each frame takes to send. The color of every frame is computed from the elapsed monotonic
+    time, so frames are skipped when sending falls behind, and the frame rate is capped so the
+    device is not sent more frames than it can take.
+
+    The same timeline drives both blocking and asyncio animations:
+
+        >>> animation = Animation(duration=1.0, max_fps=50)
+        >>> while True:
+        ...     progress = animation.progress()
+        ...     # send the frame for progress 0.0 .. 1.0
+        ...     if progress >= 1.0:
+        ...         break
+        ...     time.sleep(animation.next_delay())
+    """
+
+    def __init__(self, duration, max_fps=None, clock=time.monotonic, start=None):
+        """
+        Constructor for the class.
+
+        @type  duration: float
+        @param duration: duration of the animation in seconds
+        @type  max_fps: float
+        @param max_fps: maximum number of frames per second, None for no limit
+        @param clock: function returning the current time in seconds
+        @type  start: float
+        @param start: clock value the animation starts at, by default the time of the first frame.
+            Animations played one after another share a schedule when each starts where the
+            previous one was due to end, so time spent sending frames does not add up.
+        """
+        self.duration = max(float(duration), 0.0)
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.clock = clock
+
+        self.frames = 0
+        self.start = start
+        self._frame_time = None
+
+    def progress(self):
+        """
+        Get the progress of the animation for the frame about to be sent. The first call
+        starts the animation.
+
+        @rtype: float
+        @return: 0.0 at the start of the animation up to 1.0 at the end
+        """
+        now = self.clock()
+
+        if self.start is None:
+            self.start = now
+
+        self._frame_time = now
+        self.frames += 1
+
+        if self.duration == 0 or now - self.start >= self.duration:
+            return 1.0
+
+        return (now - self.start) / self.duration
+
+    def next_delay(self):
+        """
+        Get the time to wait before the next frame. It is zero when the animation is behind
+        schedule and never extends past the end of the animation.
+
+        @rtype: float
+        @return: time in seconds
+        """
+        now = self.clock()
+        next_time = min(self._frame_time + self.min_interval, self.start + self.duration)
+
+        return max(next_time - now, 0.0)
+
+
+def interpolate_color(start, end, progress):
+    """
+    Get the color at a point of a linear transition.
+
+    @type  start: (float, float, float)
+    @param start: R, G and B values at the start of the transition
+    @type  end: (float, float, float)
+    @param end: R, G and B values at the end of the transition
+    @type  progress: float
+    @param progress: 0.0 .. 1.0 position in the transition
+    @rtype: (float, float, float)
+    @return: R, G and B values
+    """
+    if progress >= 1.0:
+        return end
+
+    return (start[0] + (end[0] - start[0]) * progress,
+            start[1] + (end[1] - start[1]) * progress,
+            start[2] + (end[2] - start[2]) * progress)
+
+
+def time_until(deadline, clock=time.monotonic):
+    """
+    Get the time left until a deadline.
+
+    @type  deadline: float
+    @param deadline: clock value of the deadline
+    @param clock: function returning the current time in seconds
+    @rtype: float
+    @return: time in seconds, zero if the deadline has passed
+    """
+    return max(deadline - clock(), 0.0)
@@ -1,18 +1,229 @@
-from blinkstick.blinkstick import BlinkStick, blinkstick_remap_rgb_value_reverse
+from blinkstick.blinkstick import BlinkStick
+from blinkstick.pro import BlinkStickPro
+from blinkstick.pro_matrix import BlinkStickProMatrix
+from blinkstick.animation import interpolate_color, time_until
+from blinkstick.transition import transition_frames
 
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import time
 
+"""
+asyncio interface for BlinkStick devices.
+"""
 
-class AsyncBlinkStick(BlinkStick):
+
+class AsyncBlinkStick(object):
     """
-    Controls BlinkStick devices in exactly the same was as the BlinkStick
-    class, but uses asyncio.sleep instead of time.sleep so that it plays nice
-    with code written using asyncio
+    Controls BlinkStick devices in the same way as the BlinkStick class, but every method which
+    talks to the device is a coroutine. The USB transfers are made on a dedicated I/O thread of
+    the device so they never block the event loop, and animations wait with asyncio.sleep.
+
+        >>> device = get_first(blinkstick=AsyncBlinkStick)
+        >>> await device.open_device()
+        >>> await device.set_color(name="red")
+        >>> await device.pulse(name="blue", repeats=3)
+
+    The wrapped device is not opened by the constructor. It is opened on the I/O thread by
+    L{open_device} or by the first coroutine which talks to the device.
+
+    Methods which only change settings, such as L{BlinkStick.set_max_rgb_value} or
+    L{BlinkStick.set_inverse}, are passed to the wrapped L{BlinkStick} object L{bstick}
+    unchanged. So are attributes, and reading L{BlinkStick.bs_serial} before the serial number
+    is known reads it from the device on the calling thread and blocks the event loop, use
+    L{get_serial} instead.
     """
 
-    @asyncio.coroutine
-    def pulse(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, repeats=1, duration=1000,
-              steps=50):
+    def __init__(self, device=None, error_reporting=True, transport=None, lazy=False, bstick=None):
+        """
+        Constructor for the class.
+
+        @type  error_reporting: Boolean
+        @param error_reporting: display errors if they occur during communication with the device
+        @type  transport: Transport
+        @param transport: connect to the device through this transport instead of USB
+        @type  lazy: bool
+        @param lazy: accepted for compatibility with L{get_first} and L{get_all}, the device is
+            always opened on the I/O thread, see L{open_device}
+        @type  bstick: BlinkStick
+        @param bstick: wrap this BlinkStick object instead of creating a new one
+        """
+        if bstick is None:
+            # opening the device would block the event loop, it is opened on the I/O thread instead
+            bstick = BlinkStick(device=device, error_reporting=error_reporting, transport=transport, lazy=True)
+
+        self.bstick = bstick
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BlinkStick I/O")
+
+    def __getattr__(self, name):
+        if name == 'bstick':
+            raise AttributeError(name)
+
+        return getattr(self.bstick, name)
+
+    def _run(self, function, *args, **kwargs):
+        """
+        Run a blocking function on the I/O thread of the device.
+
+        @return: awaitable result of the function
+        """
+        loop = asyncio.get_running_loop()
+
+        if kwargs:
+            return loop.run_in_executor(self._executor, lambda: function(*args, **kwargs))
+
+        return loop.run_in_executor(self._executor, function, *args)
+
+    def close(self):
+        """
+        Stop the I/O thread of the device.
+        """
+        self._executor.shutdown()
+
+    async def open_device(self):
+        """
+        Open the device and read its serial number, which the L{BlinkStick} constructor does
+        unless it is lazy.
+
+        @rtype: bool
+        @return: True if the device is ready
+        """
+        return await self._run(self._open_device)
+
+    def _open_device(self):
+        opened = self.bstick.open_device()
+        self.bstick.get_serial()
+
+        return opened
+
+    async def get_serial(self):
+        """
+        See L{BlinkStick.get_serial}.
+        """
+        return await self._run(self.bstick.get_serial)
+
+    async def get_manufacturer(self):
+        """
+        See L{BlinkStick.get_manufacturer}.
+        """
+        return await self._run(self.bstick.get_manufacturer)
+
+    async def get_description(self):
+        """
+        See L{BlinkStick.get_description}.
+        """
+        return await self._run(self.bstick.get_description)
+
+    async def set_color(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, force=False):
+        """
+        See L{BlinkStick.set_color}.
+        """
+        return await self._run(self.bstick.set_color, channel, index, red, green, blue, name, hexadecimal, force)
+
+    async def set_colors(self, channel=0, colors=None, force=False):
+        """
+        See L{BlinkStick.set_colors}.
+        """
+        return await self._run(self.bstick.set_colors, channel, colors, force)
+
+    async def get_color(self, index=0, color_format='rgb', channel=0):
+        """
+        See L{BlinkStick.get_color}.
+        """
+        return await self._run(self.bstick.get_color, index, color_format, channel)
+
+    async def refresh(self, channel=0, count=1):
+        """
+        See L{BlinkStick.refresh}.
+        """
+        return await self._run(self.bstick.refresh, channel, count)
+
+    async def set_led_data(self, channel, data, force=False):
+        """
+        See L{BlinkStick.set_led_data}.
+        """
+        return await self._run(self.bstick.set_led_data, channel, data, force)
+
+    async def get_led_data(self, count, channel=0):
+        """
+        See L{BlinkStick.get_led_data}.
+        """
+        return await self._run(self.bstick.get_led_data, count, channel)
+
+    async def set_mode(self, mode):
+        """
+        See L{BlinkStick.set_mode}.
+        """
+        return await self._run(self.bstick.set_mode, mode)
+
+    async def get_mode(self):
+        """
+        See L{BlinkStick.get_mode}.
+        """
+        return await self._run(self.bstick.get_mode)
+
+    async def set_led_count(self, count):
+        """
+        See L{BlinkStick.set_led_count}.
+        """
+        return await self._run(self.bstick.set_led_count, count)
+
+    async def get_led_count(self):
+        """
+        See L{BlinkStick.get_led_count}.
+        """
+        return await self._run(self.bstick.get_led_count)
+
+    async def get_info_block1(self):
+        """
+        See L{BlinkStick.get_info_block1}.
+        """
+        return await self._run(self.bstick.get_info_block1)
+
+    async def get_info_block2(self):
+        """
+        See L{BlinkStick.get_info_block2}.
+        """
+        return await self._run(self.bstick.get_info_block2)
+
+    async def set_info_block1(self, data):
+        """
+        See L{BlinkStick.set_info_block1}.
+        """
+        return await self._run(self.bstick.set_info_block1, data)
+
+    async def set_info_block2(self, data):
+        """
+        See L{BlinkStick.set_info_block2}.
+        """
+        return await self._run(self.bstick.set_info_block2, data)
+
+    async def set_random_color(self):
+        """
+        See L{BlinkStick.set_random_color}.
+        """
+        return await self._run(self.bstick.set_random_color)
+
+    async def turn_off(self):
+        """
+        See L{BlinkStick.turn_off}.
+        """
+        return await self._run(self.bstick.turn_off)
+
+    async def open_device(self, device=None):
+        """
+        See L{BlinkStick.open_device}.
+        """
+        return await self._run(self.bstick.open_device, device)
+
+    async def flush(self):
+        """
+        See L{BlinkStick.flush}.
+        """
+        return await self._run(self.bstick.flush)
+
+    async def pulse(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, repeats=1,
+                    duration=1000, steps=50):
         """
         Morph to the specified color from black and back again.
 
@@ -37,20 +248,27 @@ class AsyncBlinkStick(BlinkStick):
         @type  steps: int
         @param steps: Number of gradient steps
         """
-        r, g, b = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        color = self.bstick._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        black = (0, 0, 0)
 
-        self.turn_off()
-        for x in range(repeats):
-            yield from self.morph(channel=channel, index=index, red=r, green=g, blue=b, duration=duration, steps=steps)
-            yield from self.morph(channel=channel, index=index, red=0, green=0, blue=0, duration=duration, steps=steps)
+        await self.turn_off()
+
+        begin = time.monotonic()
+        for n in range(repeats * 2):
+            morph_start = begin + n * duration / 1000.0
+            await asyncio.sleep(time_until(morph_start))
 
-    @asyncio.coroutine
-    def blink(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, repeats=1, delay=500):
+            animation = self.bstick._create_animation(duration, steps, morph_start)
+            if n % 2:
+                await self._play_morph(channel, index, animation, color, black)
+            else:
+                await self._play_morph(channel, index, animation, black, color)
+
+    async def blink(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, repeats=1,
+                    delay=500):
         """
         Blink the specified color.
 
-        Asyncio friendly version
-
         @type channel: int
         @param channel: led channel
         @type index: int
@@ -70,17 +288,18 @@ class AsyncBlinkStick(BlinkStick):
         @type  delay: int
         @param delay: time in milliseconds to light LED for, and also between blinks
         """
-        r, g, b = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        r, g, b = self.bstick._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
         ms_delay = float(delay) / float(1000)
+        start = time.monotonic()
         for x in range(repeats):
-            if x:
-                yield from asyncio.sleep(ms_delay)
-            self.set_color(channel=channel, index=index, red=r, green=g, blue=b)
-            yield from asyncio.sleep(ms_delay)
-            self.set_color(channel=channel, index=index)
+            on_time = start + 2 * x * ms_delay
+            await asyncio.sleep(time_until(on_time))
+            await self.set_color(channel=channel, index=index, red=r, green=g, blue=b)
+            await asyncio.sleep(time_until(on_time + ms_delay))
+            await self.set_color(channel=channel, index=index)
 
-    @asyncio.coroutine
-    def morph(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, duration=1000, steps=50):
+    async def morph(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, duration=1000,
+                    steps=50):
         """
         Morph to the specified color.
 
@@ -101,22 +320,144 @@ class AsyncBlinkStick(BlinkStick):
         @type  duration: int
         @param duration: Duration for morph in milliseconds
         @type  steps: int
-        @param steps: Number of gradient steps (default 50)
+        @param steps: Maximum number of gradient steps (default 50)
+        """
+        # reading the start color may need a transfer
+        animation, start, end = await self._run(self.bstick._prepare_morph, channel, index, red, green, blue, name,
+                                                hexadecimal, duration, steps)
+
+        await self._play_morph(channel, index, animation, start, end)
+
+    async def _play_morph(self, channel, index, animation, start, end):
+        while True:
+            progress = animation.progress()
+
+            r, g, b = interpolate_color(start, end, progress)
+            await self.set_color(channel=channel, index=index, red=r, green=g, blue=b)
+
+            if progress >= 1.0:
+                break
+
+            await asyncio.sleep(animation.next_delay())
+
+    async def morph_led_data(self, channel, data, duration=1000, steps=50):
+        """
+        See L{BlinkStick.morph_led_data}.
         """
-        r_end, g_end, b_end = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        start = await self.get_led_data(len(data), channel)
+        ms_delay = float(duration) / float(1000 * max(steps, 1))
+        begin = time.monotonic()
 
-        r_start, g_start, b_start = blinkstick_remap_rgb_value_reverse(self._get_color_rgb(index), self.max_rgb_value)
+        for n, frame in enumerate(transition_frames(start, data, steps), 1):
+            await self.set_led_data(channel, frame)
+            await asyncio.sleep(time_until(begin + n * ms_delay))
 
-        gradient = self._get_grandient_values(r_start, g_start, b_start, r_end, g_end, b_end, steps)
 
-        ms_delay = float(duration) / float(1000 * steps)
+class AsyncBlinkStickPro(BlinkStickPro):
+    """
+    Controls BlinkStick Pro devices in the same way as the BlinkStickPro class, but L{send_data},
+    L{send_data_all} and L{off} are coroutines. Frames are sent on a dedicated I/O thread of
+    the device and the transmission delay or frame rate target passed to the constructor, see
+    L{BlinkStickPro.set_fps}, is waited for with asyncio.sleep. Several boards can therefore
+    be driven at their own frame rates from one event loop:
+
+        >>> pro = AsyncBlinkStickPro(r_led_count=32, fps=60)
+        >>> pro.connect()
+        >>> pro.set_color(0, 0, 255, 0, 0)
+        >>> await pro.send_data_all()
+    """
 
-        self.set_color(channel=channel, index=index, red=r_start, green=g_start, blue=b_start)
+    _executor = None
+
+    def _run(self, function, *args):
+        """
+        Run a blocking function on the I/O thread of the device.
+
+        @return: awaitable result of the function
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BlinkStick Pro I/O")
+
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def close(self):
+        """
+        Stop the I/O thread of the device.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def send_data(self, channel, force=False):
+        """
+        Send data stored in the internal buffer to the channel. Completes when the data has been
+        sent to the device and the transmission delay has passed.
+
+        @param channel:
+            - 0 - R pin on BlinkStick Pro board
+            - 1 - G pin on BlinkStick Pro board
+            - 2 - B pin on BlinkStick Pro board
+        @type force: bool
+        @param force: send the data even if it is the same as the last data sent,
+            see L{set_skip_redundant_writes}
+        """
+        # copy the frame before yielding to the event loop so later changes are not sent
+        packet_data = bytes(self._channel_data(channel))
 
-        for grad in gradient:
-            grad_r, grad_g, grad_b = grad
+        try:
+            delay = await self._run(self._send_paced, self.bstick.set_led_data, channel, packet_data, force)
 
-            self.set_color(channel=channel, index=index, red=grad_r, green=grad_g, blue=grad_b)
-            yield from asyncio.sleep(ms_delay)
+            if delay:
+                await asyncio.sleep(delay)
+        except Exception as e:
+            print("Exception: {0}".format(e))
 
-        self.set_color(channel=channel, index=index, red=r_end, green=g_end, blue=b_end)
+    async def send_data_all(self, force=False):
+        """
+        Send data to all channels
+
+        @type force: bool
+        @param force: send the data even if it is the same as the last data sent,
+            see L{set_skip_redundant_writes}
+        """
+        if self.pipelined:
+            await self._send_pipelined(force)
+            return
+
+        if self.r_led_count > 0:
+            await self.send_data(0, force)
+
+        if self.g_led_count > 0:
+            await self.send_data(1, force)
+
+        if self.b_led_count > 0:
+            await self.send_data(2, force)
+
+    async def _send_pipelined(self, force):
+        try:
+            # encoded on the event loop so the data can not change while the reports are sent
+            delay = await self._run(self._send_paced, self._send_frames, self._encode_frames(), force)
+
+            if delay:
+                await asyncio.sleep(delay)
+        except Exception as e:
+            print("Exception: {0}".format(e))
+
+    async def off(self):
+        """
+        Set all pixels to black in on the device.
+        """
+        self.clear()
+        await self.send_data_all()
+
+
+class AsyncBlinkStickProMatrix(AsyncBlinkStickPro, BlinkStickProMatrix):
+    """
+    Controls LED matrices in the same way as the BlinkStickProMatrix class, with the coroutines
+    of L{AsyncBlinkStickPro} to send the data.
+
+        >>> matrix = AsyncBlinkStickProMatrix(r_columns=8, r_rows=8, fps=30)
+        >>> matrix.connect()
+        >>> matrix.set_color(x=2, y=5, r=255, g=0, b=0)
+        >>> await matrix.send_data_all()
+    """
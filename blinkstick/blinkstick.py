@@ -1,26 +1,22 @@
 from random import randint
 from blinkstick._version import __version__
-from blinkstick.exception import BlinkStickException
+from blinkstick.exception import BlinkStickException, BlinkStickTransportException
+from blinkstick.transport import VENDOR_ID, PRODUCT_ID, create_transport, find_devices, find_device_by_serial, registry
+from blinkstick.worker import OutputWorker
+from blinkstick.reconnect import ReconnectPolicy, CircuitBreaker, DROPPED
+from blinkstick.metrics import TransferMetrics
+from blinkstick.animation import Animation, interpolate_color, time_until
+from blinkstick.transition import transition_frames
 
 import time
-import sys
 import re
-import collections
-
-if sys.platform == "win32":
-    import pywinusb.hid as hid
-    from ctypes import *
-else:
-    import usb.core
-    import usb.util
+import threading
+import functools
 
 """
 Main module to control BlinkStick and BlinkStick Pro devices.
 """
 
-VENDOR_ID = 0x20a0
-PRODUCT_ID = 0x41e5
-
 
 class BlinkStick(object):
     """
@@ -181,72 +177,203 @@ class BlinkStick(object):
                      'yellow': '#ffff00',
                      'yellowgreen': '#9acd32'}
 
+    # parsed once so that color names do not need to be converted on every call
+    _names_to_rgb = dict((name, (int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16)))
+                         for name, value in _names_to_hex.items())
+
     HEX_COLOR_RE = re.compile(r'^#([a-fA-F0-9]{3}|[a-fA-F0-9]{6})$')
 
     inverse = False
     error_reporting = True
     max_rgb_value = 255
-
-    def __init__(self, device=None, error_reporting=True):
+    skip_redundant_writes = False
+    output_worker = None
+    circuit_breaker = None
+    metrics = None
+    color_correction = None
+    animation_max_fps = 100
+    _bs_serial = None
+    _opened = False
+
+    def __init__(self, device=None, error_reporting=True, transport=None, lazy=False):
         """
         Constructor for the class.
 
+        @type  device: usb.core.Device
+        @param device: device found by L{find_devices}
         @type  error_reporting: Boolean
         @param error_reporting: display errors if they occur during communication with the device
+        @type  transport: Transport
+        @param transport: transport to use instead of the platform USB transport, for example
+            L{blinkstick.simulator.SimulatedTransport}
+        @type  lazy: bool
+        @param lazy: do not open the device and read its serial number until it is first used
         """
         self.error_reporting = error_reporting
+        self.transport = transport
+        self.reconnect_policy = ReconnectPolicy()
+
+        # Shadow of the LED data on each of the R, G and B channels in GRB order,
+        # with a flag for each LED whose color is known
+        self._led_frames = [bytearray(64 * 3) for i in range(0, 3)]
+        self._led_known = [bytearray(64) for i in range(0, 3)]
+
+        # Reusable report buffers for LED data reports 6..9
+        self._led_reports = dict((report_id, bytearray(2 + max_leds * 3))
+                                 for report_id, max_leds in ((6, 8), (7, 16), (8, 32), (9, 64)))
+
+        # Reports last sent per (report id, channel, index) when redundant writes are skipped
+        self._sent_reports = {}
+        self.writes_sent = 0
+        self.writes_skipped = 0
+        self.writes_dropped = 0
 
         if device:
-            self.device = device
-            if sys.platform == "win32":
-                self.device.open()
-                self.reports = self.device.find_feature_reports()
+            self.transport = create_transport(device)
+
+        if self.transport is not None and not lazy:
+            self.open_device()
+            self.get_serial()
+
+    @property
+    def bs_serial(self):
+        """
+        Serial number of the device, read from the device when it is first needed.
+        """
+        if self._bs_serial is None and self.transport is not None:
+            self.get_serial()
+
+        return self._bs_serial
+
+    @property
+    def device(self):
+        """
+        Device handle of the transport, or None if the object is not connected to a device.
+        """
+        if self.transport is not None:
+            return self.transport.device
+
+    def _usb_get_string(self, index):
+        if not self._opened:
+            self.open_device()
+
+        worker = self.output_worker
+        if worker is not None and threading.current_thread() is not worker:
+            return worker.call(self._usb_get_string, index)
+
+        self._check_circuit_breaker(False)
+
+        return self._reconnecting(self._transport_string, index)
+
+    def _usb_ctrl_transfer(self, bm_request_type, b_request, w_value, w_index, data_or_w_length):
+        if not self._opened:
+            self.open_device()
+
+        worker = self.output_worker
+        if worker is not None and threading.current_thread() is not worker:
+            if bm_request_type == 0x80 | 0x20:
+                return worker.call(self._usb_ctrl_transfer, bm_request_type, b_request, w_value, w_index,
+                                   data_or_w_length)
             else:
-                self.open_device(device)
+                return worker.write(w_value, data_or_w_length)
+
+        if self._check_circuit_breaker(bm_request_type != 0x80 | 0x20):
+            return DROPPED
+
+        return self._reconnecting(self._transport_transfer, bm_request_type, w_value, data_or_w_length)
+
+    def _check_circuit_breaker(self, write):
+        # True if the write should be dropped, raises if the transfer must not be attempted
+        breaker = self.circuit_breaker
+        if breaker is None or not breaker.is_open():
+            return False
+
+        if write and self.reconnect_policy.drop_writes:
+            return True
+
+        raise BlinkStickException("BlinkStick {0} is not responding".format(self._bs_serial))
 
-            self.bs_serial = self.get_serial()
+    def _reconnecting(self, function, *args):
+        breaker = self.circuit_breaker
 
-    def _usb_get_string(self, device, index):
         try:
-            return usb.util.get_string(device, index)
-        except usb.USBError:
+            result = function(*args)
+        except BlinkStickTransportException:
             # Could not communicate with BlinkStick device
             # attempt to find it again based on serial
+            policy = self.reconnect_policy
 
-            if self._refresh_device():
-                return usb.util.get_string(self.device, index)
-            else:
-                raise BlinkStickException("Could not communicate with BlinkStick {0}".format(self.bs_serial))
+            for attempt in range(0, policy.retries):
+                if self.metrics is not None:
+                    self.metrics.record_retry()
 
-    def _usb_ctrl_transfer(self, bm_request_type, b_request, w_value, w_index, data_or_w_length):
-        if sys.platform == "win32":
-            if bm_request_type == 0x20:
-                data = (c_ubyte * len(data_or_w_length))(*[c_ubyte(ord(c)) for c in data_or_w_length])
-                data[0] = w_value
-                if not self.device.send_feature_report(data):
-                    if self._refresh_device():
-                        self.device.send_feature_report(data)
-                    else:
-                        raise BlinkStickException("Could not communicate with BlinkStick {0}".format(self.bs_serial))
-
-            elif bm_request_type == 0x80 | 0x20:
-                return self.reports[w_value - 1].get()
-        else:
-            try:
-                return self.device.ctrl_transfer(bm_request_type, b_request, w_value, w_index, data_or_w_length)
-            except usb.USBError:
-                # Could not communicate with BlinkStick device
-                # attempt to find it again based on serial
+                backoff = policy.get_backoff(attempt)
+                if backoff:
+                    time.sleep(backoff)
 
                 if self._refresh_device():
-                    return self.device.ctrl_transfer(bm_request_type, b_request, w_value, w_index, data_or_w_length)
-                else:
-                    raise BlinkStickException("Could not communicate with BlinkStick {0}".format(self.bs_serial))
+                    try:
+                        result = function(*args)
+                        break
+                    except BlinkStickTransportException:
+                        pass
+            else:
+                if breaker is not None:
+                    breaker.record_failure()
+
+                raise BlinkStickException("Could not communicate with BlinkStick {0}".format(self._bs_serial))
+
+        if breaker is not None:
+            breaker.record_success()
+
+        return result
+
+    def _transport_string(self, index):
+        return self.transport.get_string(index)
+
+    def _transport_transfer(self, bm_request_type, report_id, data_or_w_length):
+        metrics = self.metrics
+
+        if metrics is None:
+            if bm_request_type == 0x80 | 0x20:
+                return self.transport.read_report(report_id, data_or_w_length)
+            else:
+                return self.transport.write_report(report_id, data_or_w_length)
+
+        start = time.perf_counter()
+
+        try:
+            if bm_request_type == 0x80 | 0x20:
+                result = self.transport.read_report(report_id, data_or_w_length)
+                bytes_sent, bytes_received = 0, len(result)
+            else:
+                result = self.transport.write_report(report_id, data_or_w_length)
+                bytes_sent, bytes_received = len(data_or_w_length), 0
+        except BlinkStickTransportException:
+            metrics.record_error()
+            raise
+
+        metrics.record_transfer(report_id, bytes_sent, bytes_received, time.perf_counter() - start)
+
+        return result
 
     def _refresh_device(self):
-        d = get_by_serial(self.bs_serial)
-        if d:
-            self.device = d.device
+        if self._bs_serial is None:
+            # the device has to be found by its serial number
+            return False
+
+        transport = self.transport.reconnect(self._bs_serial)
+        if transport is not None:
+            transport.open()
+            self.transport = transport
+
+            if self.metrics is not None:
+                self.metrics.record_reconnect()
+
+            # the device may have been power cycled, forget what is known about its LEDs
+            self._sent_reports.clear()
+            for known in self._led_known:
+                known[:] = bytes(len(known))
             return True
 
     def get_serial(self):
@@ -264,10 +391,13 @@ class BlinkStick(object):
         @rtype: str
         @return: Serial number of the device
         """
-        if sys.platform == "win32":
-            return self.device.serial_number
-        else:
-            return self._usb_get_string(self.device, 3)
+        serial = self._usb_get_string(3)
+
+        if self._bs_serial is None:
+            self._bs_serial = serial
+            registry.register(serial, self.transport.location)
+
+        return serial
 
     def get_manufacturer(self):
         """
@@ -276,10 +406,7 @@ class BlinkStick(object):
         @rtype: str
         @return: Device manufacturer's name
         """
-        if sys.platform == "win32":
-            return self.device.vendor_name
-        else:
-            return self._usb_get_string(self.device, 1)
+        return self._usb_get_string(1)
 
     def get_description(self):
         """
@@ -288,10 +415,7 @@ class BlinkStick(object):
         @rtype: str
         @return: Device description
         """
-        if sys.platform == "win32":
-            return self.device.product_name
-        else:
-            return self._usb_get_string(self.device, 2)
+        return self._usb_get_string(2)
 
     def set_error_reporting(self, error_reporting):
         """
@@ -302,7 +426,7 @@ class BlinkStick(object):
         """
         self.error_reporting = error_reporting
 
-    def set_color(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None):
+    def set_color(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, force=False):
         """
         Set the color to the device as RGB
 
@@ -320,17 +444,18 @@ class BlinkStick(object):
         @param name: Use CSS color name as defined here: U{http://www.w3.org/TR/css3-color/}
         @type  hexadecimal: str
         @param hexadecimal: Specify color using hexadecimal color value e.g. '#FF3366'
+        @type  force: bool
+        @param force: send the color even if it is the same as the last one sent, see L{set_skip_redundant_writes}
         """
 
-        red, green, blue = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
-
-        r = int(round(red, 3))
-        g = int(round(green, 3))
-        b = int(round(blue, 3))
+        r, g, b = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
 
         if self.inverse:
             r, g, b = 255 - r, 255 - g, 255 - b
 
+        self._send_color(channel, index, r, g, b, force)
+
+    def _send_color(self, channel, index, r, g, b, force=False):
         # if index == 0 and channel == 0:
         #     control_string = bytes(bytearray([0, r, g, b]))
         #     report_id = 0x0001
@@ -338,18 +463,147 @@ class BlinkStick(object):
         #     control_string = bytes(bytearray([5, channel, index, r, g, b]))
         #     report_id = 0x0005
 
-        control_string = bytes(bytearray([5, channel, index, r, g, b]))
+        sent_r, sent_g, sent_b = r, g, b
+        if self.color_correction is not None:
+            sent_r, sent_g, sent_b = self.color_correction.correct_rgb(r, g, b)
+
+        control_string = bytes(bytearray([5, channel, index, sent_r, sent_g, sent_b]))
         report_id = 0x0005
 
         if self.error_reporting:
-            self._usb_ctrl_transfer(0x20, 0x9, report_id, 0, control_string)
+            sent = self._write_report(report_id, control_string, channel, index, force)
         else:
             try:
-                self._usb_ctrl_transfer(0x20, 0x9, report_id, 0, control_string)
-            except usb.core.USBError:
-                pass
+                sent = self._write_report(report_id, control_string, channel, index, force)
+            except BlinkStickException:
+                self._swallowed_error()
+                return
+
+        if not sent:
+            # skipped reports are already in the copy, dropped ones never reached the device
+            return
+
+        self._led_frames[channel][index * 3:index * 3 + 3] = bytearray([g, r, b])
+        self._led_known[channel][index] = 1
+
+    def set_colors(self, channel=0, colors=None, force=False):
+        """
+        Set the color of several LEDs on a channel with as few USB transfers as possible.
+
+        The updates are merged into the LED data last written to the channel by this object and sent
+        as a single LED data frame, unless sending the colors one by one is cheaper. LEDs below the
+        highest updated index which have not been written yet are sent as off.
+
+            >>> b.set_colors(channel=0, colors={0: (255, 0, 0), 3: '#00ff00', 7: 'blue'})
+            >>> b.set_colors(channel=0, colors=['red', 'green', 'blue'])
+
+        @type channel: int
+        @param channel: led channel
+        @type colors: dict or list
+        @param colors: dictionary of index to color or a sequence of colors starting at index 0.
+            Each color can be a (r, g, b) tuple, hexadecimal string e.g. '#FF3366' or CSS color name
+        @type  force: bool
+        @param force: send the colors even if they are the same as the last ones sent,
+            see L{set_skip_redundant_writes}
+        """
+
+        if not colors:
+            return
+
+        if not isinstance(colors, dict):
+            colors = dict(enumerate(colors))
+
+        updates = []
+        for index, color in colors.items():
+            r, g, b = self._color_to_rgb(color)
+
+            if self.inverse:
+                r, g, b = 255 - r, 255 - g, 255 - b
+
+            updates.append((index, r, g, b))
+
+        led_count = max(colors) + 1
+        report_id, max_leds = self._determine_report_id(led_count * 3)
+
+        if len(updates) * _transfer_cost(6) < _transfer_cost(2 + max_leds * 3):
+            for index, r, g, b in updates:
+                self._send_color(channel, index, r, g, b, force)
+            return
+
+        frame = self._led_frames[channel][0:led_count * 3]
+        for index, r, g, b in updates:
+            frame[index * 3:index * 3 + 3] = bytearray([g, r, b])
+
+        if self.error_reporting:
+            self.set_led_data(channel, frame, force)
+        else:
+            try:
+                self.set_led_data(channel, frame, force)
+            except BlinkStickException:
+                self._swallowed_error()
+
+    def _swallowed_error(self):
+        if self.metrics is not None:
+            self.metrics.record_swallowed_error()
+
+    def _dropped_write(self):
+        self.writes_dropped += 1
+
+        if self.metrics is not None:
+            self.metrics.record_dropped_write()
+
+    def _write_report(self, report_id, report, channel, index=None, force=False):
+        """
+        Send a report which changes LED colors, unless redundant writes are skipped and
+        the same report has already been sent.
+
+        @rtype: bool
+        @return: True if the report was sent, False if it was skipped or dropped
+            while the circuit breaker is open
+        """
+        key = (report_id, channel, index)
+
+        if self.skip_redundant_writes and not force and self._sent_reports.get(key) == report:
+            self.writes_skipped += 1
+            return False
+
+        if self.skip_redundant_writes:
+            # LED data frames overwrite every LED on the channel, single LED reports
+            # overwrite the LED inside any frame sent before
+            for sent_key in list(self._sent_reports):
+                if sent_key[1] == channel and (report_id != 5 or sent_key[0] != 5 or sent_key == key):
+                    del self._sent_reports[sent_key]
+
+        if self._usb_ctrl_transfer(0x20, 0x9, report_id, 0, report) is DROPPED:
+            self._dropped_write()
+            return False
+
+        self.writes_sent += 1
+
+        if self.skip_redundant_writes:
+            self._sent_reports[key] = bytes(report)
+
+        return True
+
+    def _color_to_rgb(self, color):
+        if isinstance(color, str):
+            if color.startswith('#'):
+                r, g, b = self._determine_rgb(hexadecimal=color)
+            else:
+                r, g, b = self._determine_rgb(name=color)
+        else:
+            r, g, b = self._determine_rgb(red=color[0], green=color[1], blue=color[2])
+
+        return r, g, b
 
     def _determine_rgb(self, red=0, green=0, blue=0, name=None, hexadecimal=None):
+        """
+        Resolve a color given as RGB values, a color name or a hexadecimal value and remap it
+        to L{max_rgb_value}.
+
+        @rtype: (int, int, int)
+        @return: remapped R, G and B values
+        """
 
         try:
             if name:
@@ -365,32 +619,43 @@ class BlinkStick(object):
         except ValueError:
             red = green = blue = 0
 
-        red, green, blue = blinkstick_remap_rgb_value([red, green, blue], self.max_rgb_value)
+        table = _remap_table(self.max_rgb_value)
 
-        # TODO - do smarts to determine input type from red var in case it is not int
+        try:
+            if red >= 0 and green >= 0 and blue >= 0:
+                return table[red], table[green], table[blue]
+        except (IndexError, TypeError):
+            # floats and values out of range are remapped the slow way
+            pass
+
+        red, green, blue = blinkstick_remap_rgb_value([red, green, blue], self.max_rgb_value)
 
         return red, green, blue
 
-    def _get_color_rgb(self, index=0):
-        if index == 0:
-            device_bytes = self._usb_ctrl_transfer(0x80 | 0x20, 0x1, 0x0001, 0, 33)
-            if self.inverse:
-                return [255 - device_bytes[1], 255 - device_bytes[2], 255 - device_bytes[3]]
-            else:
-                return [device_bytes[1], device_bytes[2], device_bytes[3]]
-        else:
-            data = self.get_led_data((index + 1) * 3)
+    def _get_color_rgb(self, index=0, channel=0):
+        if not self._led_known[channel][index]:
+            self._refresh(channel, index + 1, strict=False)
 
-            return [data[index * 3 + 1], data[index * 3], data[index * 3 + 2]]
+        g, r, b = self._led_frames[channel][index * 3:index * 3 + 3]
 
-    def _get_color_hex(self, index=0):
-        r, g, b = self._get_color_rgb(index)
+        if self.inverse:
+            return [255 - r, 255 - g, 255 - b]
+        else:
+            return [r, g, b]
+
+    def _get_color_hex(self, index=0, channel=0):
+        r, g, b = self._get_color_rgb(index, channel)
         return '#%02x%02x%02x' % (r, g, b)
 
-    def get_color(self, index=0, color_format='rgb'):
+    def get_color(self, index=0, color_format='rgb', channel=0):
         """
         Get the current device color in the defined format.
 
+        The color is served from the copy of the LED data kept by this object and the device is
+        only queried for LEDs which have not been written yet. LEDs which can not be read back,
+        because the device holds the data of another channel, are black until they are written.
+        Use L{refresh} to read the colors back from the device.
+
         Currently supported formats:
 
             1. rgb (default) - Returns values as 3-tuple (r,g,b)
@@ -407,6 +672,8 @@ class BlinkStick(object):
         @param index: the index of the LED
         @type  color_format: str
         @param color_format: "rgb" or "hex". Defaults to "rgb".
+        @type  channel: int
+        @param channel: led channel
 
         @rtype: (int, int, int) or str
         @return: Either 3-tuple for R, G and B values, or hex string
@@ -414,12 +681,60 @@ class BlinkStick(object):
 
         # Attempt to find a function to return the appropriate format
         get_color_func = getattr(self, "_get_color_%s" % color_format, self._get_color_rgb)
-        if isinstance(get_color_func, collections.Callable):
-            return get_color_func(index)
+        if callable(get_color_func):
+            return get_color_func(index, channel)
         else:
             # Should never get here, as we should always default to self._get_color_rgb
             raise BlinkStickException("Could not return current color in format %s" % color_format)
 
+    def refresh(self, channel=0, count=1):
+        """
+        Read the LED data back from the device and update the copy kept by this object.
+
+        The color of the first LED on channel 0 is read with report 1, which is supported by all
+        devices. Otherwise the LED data RAM is read, which holds the data of the channel written last,
+        and L{BlinkStickException} is raised if that is not the requested channel.
+
+        @type  channel: int
+        @param channel: led channel
+        @type  count: int
+        @param count: number of LEDs to read back, 1..64
+        """
+        self._refresh(channel, count)
+
+    def _refresh(self, channel, count, strict=True):
+        if channel == 0 and count == 1:
+            device_bytes = self._usb_ctrl_transfer(0x80 | 0x20, 0x1, 0x0001, 0, 33)
+            self._led_frames[0][0:3] = bytearray([device_bytes[2], device_bytes[1], device_bytes[3]])
+            self._led_known[0][0] = 1
+        else:
+            self._read_led_data(channel, count, strict)
+
+    def _read_led_data(self, channel, count, strict=True):
+        report_id, max_leds = self._determine_report_id(count * 3)
+
+        device_bytes = self._usb_ctrl_transfer(0x80 | 0x20, 0x1, report_id, 0, max_leds * 3 + 2)
+
+        led_data = bytearray(device_bytes[2:2 + max_leds * 3])
+        device_channel = device_bytes[1]
+
+        if device_channel != channel:
+            # the LED data RAM only holds the data of the channel written last, keep it for that channel
+            if 0 <= device_channel < len(self._led_frames):
+                self._led_frames[device_channel][0:len(led_data)] = led_data
+                self._led_known[device_channel][0:len(led_data) // 3] = _ONES[0:len(led_data) // 3]
+
+            if strict:
+                raise BlinkStickException("LED data of channel {0} can not be read, the device holds the data "
+                                          "of channel {1}".format(channel, device_channel))
+
+            # LEDs which can not be read back keep the colors last written to them, black if never written
+            self._led_known[channel][0:count] = _ONES[0:count]
+            return
+
+        self._led_frames[channel][0:len(led_data)] = led_data
+        self._led_known[channel][0:len(led_data) // 3] = _ONES[0:len(led_data) // 3]
+
     def _determine_report_id(self, led_count):
         report_id = 9
         max_leds = 64
@@ -439,7 +754,7 @@ class BlinkStick(object):
 
         return report_id, max_leds
 
-    def set_led_data(self, channel, data):
+    def set_led_data(self, channel, data, force=False):
         """
         Send LED data frame.
 
@@ -447,35 +762,113 @@ class BlinkStick(object):
         @param channel: the channel which to send data to (R=0, G=1, B=2)
         @type  data: int[0..64*3]
         @param data: The LED data frame in GRB format
+        @type  force: bool
+        @param force: send the frame even if it is the same as the last one sent, see L{set_skip_redundant_writes}
+        @rtype: bool
+        @return: True if the frame was sent, False if it was skipped as redundant
+        """
+
+        report_id, max_leds, report = self._encode_led_data(channel, data)
+
+        return self._send_led_data(channel, report_id, max_leds, report, force)
+
+    def _send_led_data(self, channel, report_id, max_leds, report, force=False):
+        """
+        Send an LED data report encoded with L{_encode_led_data}.
+
+        @rtype: bool
+        @return: True if the frame was sent, False if it was skipped as redundant
+        """
+        sent_report = report
+        if self.color_correction is not None:
+            sent_report = self.color_correction.correct_report(report)
+
+        if not self._write_report(report_id, sent_report, channel, force=force):
+            return False
+
+        self._led_frames[channel][0:max_leds * 3] = memoryview(report)[2:]
+        self._led_known[channel][0:max_leds] = _ONES[0:max_leds]
+
+        return True
+
+    def _encode_led_data(self, channel, data, report=None):
+        """
+        Encode LED data into a report without allocating a new buffer for every frame.
+
+        @type  channel: int
+        @param channel: the channel which to send data to (R=0, G=1, B=2)
+        @type  data: list, bytes, bytearray, memoryview, array('B') or any other object
+            supporting the buffer protocol
+        @param data: The LED data frame in GRB format
+        @type  report: bytearray
+        @param report: buffer to encode the report into, by default the buffer kept
+            for the report id is reused
+        @rtype: (int, int, bytearray)
+        @return: report id, number of LEDs in the report and the encoded report
         """
+        if not isinstance(data, (list, tuple, bytes, bytearray)):
+            data = _led_data_view(data)
 
         report_id, max_leds = self._determine_report_id(len(data))
+        size = max_leds * 3
 
-        report = [0, channel]
+        if len(data) > size:
+            data = data[0:size]
 
-        for i in range(0, max_leds * 3):
-            if len(data) > i:
-                report.append(data[i])
-            else:
-                report.append(0)
+        length = len(data)
 
-        self._usb_ctrl_transfer(0x20, 0x9, report_id, 0, bytes(bytearray(report)))
+        if report is None:
+            report = self._led_reports[report_id]
 
-    def get_led_data(self, count):
+        report[1] = channel
+        report[2:2 + length] = data
+        report[2 + length:] = _ZEROS[0:size - length]
+
+        return report_id, max_leds, report
+
+    def morph_led_data(self, channel, data, duration=1000, steps=50):
+        """
+        Morph all LEDs of a channel from their current colors to a new LED data frame.
+
+        @type  channel: int
+        @param channel: the channel which to send data to (R=0, G=1, B=2)
+        @type  data: int[0..64*3]
+        @param data: The LED data frame at the end of the morph in GRB format
+        @type  duration: int
+        @param duration: Duration for morph in milliseconds
+        @type  steps: int
+        @param steps: Number of frames to send (default 50)
+        """
+        start = self.get_led_data(len(data), channel)
+        ms_delay = float(duration) / float(1000 * max(steps, 1))
+        begin = time.monotonic()
+
+        for n, frame in enumerate(transition_frames(start, data, steps), 1):
+            self.set_led_data(channel, frame)
+            time.sleep(time_until(begin + n * ms_delay))
+
+    def get_led_data(self, count, channel=0):
         """
         Get LED data frame on the device.
 
+        The data is served from the copy of the LED data kept by this object and the device is
+        only queried if some of the LEDs have not been written yet. Use L{refresh} to read the
+        data back from the device.
+
         @type  count: int
         @param count: How much data to retrieve. Can be in the range of 0..64*3
+        @type  channel: int
+        @param channel: the channel to retrieve data for (R=0, G=1, B=2)
         @rtype: int[0..64*3]
-        @return: LED data currently stored in the RAM of the device
+        @return: LED data currently stored in the RAM of the device in GRB format
         """
 
-        report_id, max_leds = self._determine_report_id(count)
+        led_count = (count + 2) // 3
 
-        device_bytes = self._usb_ctrl_transfer(0x80 | 0x20, 0x1, report_id, 0, max_leds * 3 + 2)
+        if not all(self._led_known[channel][0:led_count]):
+            self._read_led_data(channel, led_count, strict=False)
 
-        return device_bytes[2: 2 + count * 3]
+        return self._led_frames[channel][0:count]
 
     def set_mode(self, mode):
         """
@@ -661,12 +1054,22 @@ class BlinkStick(object):
         @type  steps: int
         @param steps: Number of gradient steps
         """
-        r, g, b = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        color = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        black = (0, 0, 0)
 
         self.turn_off()
-        for x in range(repeats):
-            self.morph(channel=channel, index=index, red=r, green=g, blue=b, duration=duration, steps=steps)
-            self.morph(channel=channel, index=index, red=0, green=0, blue=0, duration=duration, steps=steps)
+
+        # every morph is scheduled from the same start time, so slow transfers do not add up over the repeats
+        begin = time.monotonic()
+        for n in range(repeats * 2):
+            morph_start = begin + n * duration / 1000.0
+            time.sleep(time_until(morph_start))
+
+            animation = self._create_animation(duration, steps, morph_start)
+            if n % 2:
+                self._play_morph(channel, index, animation, color, black)
+            else:
+                self._play_morph(channel, index, animation, black, color)
 
     def blink(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, repeats=1, delay=500):
         """
@@ -693,11 +1096,12 @@ class BlinkStick(object):
         """
         r, g, b = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
         ms_delay = float(delay) / float(1000)
+        start = time.monotonic()
         for x in range(repeats):
-            if x:
-                time.sleep(ms_delay)
+            on_time = start + 2 * x * ms_delay
+            time.sleep(time_until(on_time))
             self.set_color(channel=channel, index=index, red=r, green=g, blue=b)
-            time.sleep(ms_delay)
+            time.sleep(time_until(on_time + ms_delay))
             self.set_color(channel=channel, index=index)
 
     def morph(self, channel=0, index=0, red=0, green=0, blue=0, name=None, hexadecimal=None, duration=1000, steps=50):
@@ -721,26 +1125,47 @@ class BlinkStick(object):
         @type  duration: int
         @param duration: Duration for morph in milliseconds
         @type  steps: int
-        @param steps: Number of gradient steps (default 50)
+        @param steps: Maximum number of gradient steps (default 50)
         """
 
-        r_end, g_end, b_end = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
+        animation, start, end = self._prepare_morph(channel, index, red, green, blue, name, hexadecimal, duration,
+                                                    steps)
 
-        r_start, g_start, b_start = blinkstick_remap_rgb_value_reverse(self._get_color_rgb(index), self.max_rgb_value)
+        self._play_morph(channel, index, animation, start, end)
 
-        gradient = self._get_grandient_values(r_start, g_start, b_start, r_end, g_end, b_end, steps)
+    def _play_morph(self, channel, index, animation, start, end):
+        while True:
+            progress = animation.progress()
 
-        ms_delay = float(duration) / float(1000 * steps)
+            r, g, b = interpolate_color(start, end, progress)
+            self.set_color(channel=channel, index=index, red=r, green=g, blue=b)
 
-        self.set_color(channel=channel, index=index, red=r_start, green=g_start, blue=b_start)
+            if progress >= 1.0:
+                break
+
+            time.sleep(animation.next_delay())
 
-        for grad in gradient:
-            grad_r, grad_g, grad_b = grad
+    def _prepare_morph(self, channel, index, red, green, blue, name, hexadecimal, duration, steps):
+        """
+        Determine the start and end colors of a morph and create its timeline.
 
-            self.set_color(channel=channel, index=index, red=grad_r, green=grad_g, blue=grad_b)
-            time.sleep(ms_delay)
+        The color of each frame is computed from the elapsed time, so the morph takes the requested
+        duration no matter how long sending each color takes. Up to steps frames are sent, limited
+        to L{animation_max_fps} frames per second.
+        """
+        end = self._determine_rgb(red=red, green=green, blue=blue, name=name, hexadecimal=hexadecimal)
 
-        self.set_color(channel=channel, index=index, red=r_end, green=g_end, blue=b_end)
+        start = blinkstick_remap_rgb_value_reverse(self._get_color_rgb(index, channel), self.max_rgb_value)
+        start = [min(value, 255) for value in start]
+
+        return self._create_animation(duration, steps), start, end
+
+    def _create_animation(self, duration, steps, start=None):
+        max_fps = self.animation_max_fps
+        if duration > 0:
+            max_fps = min(max_fps, steps * 1000.0 / duration)
+
+        return Animation(duration / 1000.0, max_fps=max_fps, start=start)
 
     def _get_grandient_values(self, r_start, g_start, b_start, r_end, g_end, b_end, steps):
 
@@ -766,17 +1191,15 @@ class BlinkStick(object):
         """Open device.
         """
 
-        d = device if not None else self.device
-        if d is None:
+        if device is not None:
+            self.transport = create_transport(device)
+
+        if self.transport is None:
             raise BlinkStickException("Could not find BlinkStick...")
 
-        if d.is_kernel_driver_active(0):
-            try:
-                d.detach_kernel_driver(0)
-            except usb.core.USBError as e:
-                raise BlinkStickException("Could not detach kernel driver: %s" % str(e))
+        self._opened = self.transport.open()
 
-        return True
+        return self._opened
 
     def get_inverse(self):
         """
@@ -808,6 +1231,162 @@ class BlinkStick(object):
         """
         self.max_rgb_value = value
 
+    def set_color_correction(self, correction):
+        """
+        Correct colors as they are sent to the device. Colors returned by L{get_color} and
+        L{get_led_data} are the uncorrected colors which were set, unless they have been read
+        back from the device with L{refresh}.
+
+        @type  correction: ColorCorrection
+        @param correction: correction to apply, None to send colors unchanged
+        """
+        self.color_correction = correction
+        self._sent_reports.clear()
+
+    def get_color_correction(self):
+        """
+        Get the color correction applied to the colors sent to the device.
+
+        @rtype: ColorCorrection
+        @return: the color correction, None if colors are sent unchanged
+        """
+        return self.color_correction
+
+    def enable_metrics(self):
+        """
+        Start collecting transfer counters and latency histograms, see L{get_metrics}.
+        """
+        if self.metrics is None:
+            self.metrics = TransferMetrics()
+
+    def disable_metrics(self):
+        """
+        Stop collecting transfer counters and latency histograms.
+        """
+        self.metrics = None
+
+    def get_metrics(self):
+        """
+        Get the transfer counters and latency histograms collected since L{enable_metrics} or
+        L{reset_metrics} was called. See L{TransferMetrics.snapshot} for the contents.
+
+        @rtype: dict
+        @return: snapshot of the metrics or None if metrics are disabled
+        """
+        if self.metrics is not None:
+            return self.metrics.snapshot()
+
+    def reset_metrics(self):
+        """
+        Set all transfer counters and latency histograms to zero.
+        """
+        if self.metrics is not None:
+            self.metrics.reset()
+
+    def set_reconnect_policy(self, policy):
+        """
+        Set how the device is reconnected after communication errors, see L{ReconnectPolicy}.
+
+            >>> b.set_reconnect_policy(ReconnectPolicy(retries=3, backoff=0.01, failure_threshold=5))
+
+        @type  policy: ReconnectPolicy
+        @param policy: policy to use
+        """
+        self.reconnect_policy = policy
+
+        if policy.failure_threshold:
+            self.circuit_breaker = CircuitBreaker(self, policy)
+        else:
+            self.circuit_breaker = None
+
+    def get_reconnect_policy(self):
+        """
+        Get the policy used to reconnect the device after communication errors.
+
+        @rtype: ReconnectPolicy
+        @return: reconnect policy
+        """
+        return self.reconnect_policy
+
+    def start_output_thread(self, maxsize=64, delay=0):
+        """
+        Start a background thread which performs all transfers to the device. Calls which change
+        the color return immediately and reports queued for the same LED or channel are collapsed,
+        so only the newest colors are sent when they are produced faster than the device takes them.
+
+        Errors are not raised to the caller while the thread is running. They are printed if error
+        reporting is enabled and kept in L{OutputWorker.last_error}.
+
+        @type  maxsize: int
+        @param maxsize: number of reports which can be queued before callers are blocked
+        @type  delay: float
+        @param delay: time in seconds to wait after each LED data frame is sent
+        @rtype: OutputWorker
+        @return: the output thread
+        """
+        if self.output_worker is None:
+            self.output_worker = OutputWorker(self, maxsize=maxsize, delay=delay)
+            self.output_worker.start()
+
+        return self.output_worker
+
+    def stop_output_thread(self):
+        """
+        Send all queued reports and stop the background thread started with L{start_output_thread}.
+        """
+        worker = self.output_worker
+
+        if worker is not None:
+            worker.stop()
+            self.output_worker = None
+
+    def flush(self):
+        """
+        Wait until all reports queued on the background thread have been sent.
+        """
+        if self.output_worker is not None:
+            self.output_worker.flush()
+
+    def set_skip_redundant_writes(self, value):
+        """
+        Skip sending colors and LED data frames which are identical to the last ones sent to the same
+        channel and LED. Use the force parameter of L{set_color}, L{set_colors} and L{set_led_data} to
+        send them regardless, for example after the device has been power cycled.
+
+        @type  value: bool
+        @param value: True/False to enable or disable skipping of redundant writes
+        """
+        self.skip_redundant_writes = value
+        self._sent_reports.clear()
+
+    def get_skip_redundant_writes(self):
+        """
+        Get whether redundant writes are skipped.
+
+        @rtype: bool
+        @return: True if redundant writes are skipped, otherwise false
+        """
+        return self.skip_redundant_writes
+
+    def get_write_counters(self):
+        """
+        Get the number of color and LED data reports sent to the device, the number
+        of reports skipped as redundant and the number of reports dropped while the
+        circuit breaker was open, see L{ReconnectPolicy}.
+
+        @rtype: dict
+        @return: dictionary with "sent", "skipped" and "dropped" counts
+        """
+        return {"sent": self.writes_sent, "skipped": self.writes_skipped, "dropped": self.writes_dropped}
+
+    def reset_write_counters(self):
+        """
+        Reset the counters returned by L{get_write_counters}.
+        """
+        self.writes_sent = 0
+        self.writes_skipped = 0
+        self.writes_dropped = 0
+
     def get_max_rgb_value(self):
         """
         Get RGB color limit. {set_color} function will automatically remap
@@ -857,8 +1436,7 @@ class BlinkStick(object):
         # (0, 0, 128)
 
         """
-        hex_digits = self._normalize_hex(hex_value)
-        return tuple([int(s, 16) for s in (hex_digits[1:3], hex_digits[3:5], hex_digits[5:7])])
+        return _parse_hex(hex_value)
 
     def _normalize_hex(self, hex_value):
         """
@@ -921,48 +1499,59 @@ class BlinkStick(object):
         # (218, 165, 32)
 
         """
-        return self._hex_to_rgb(self._name_to_hex(name))
+        try:
+            return self._names_to_rgb[name.lower()]
+        except KeyError:
+            raise ValueError("'%s' is not defined as a named color." % name)
 
 
-def _find_blicksticks(find_all=True):
-    if sys.platform == "win32":
-        devices = hid.HidDeviceFilter(vendor_id=VENDOR_ID, product_id=PRODUCT_ID).get_devices()
-        if find_all:
-            return devices
-        elif len(devices) > 0:
-            return devices[0]
-        else:
-            return None
+@functools.lru_cache(maxsize=512)
+def _parse_hex(hex_value):
+    match = BlinkStick.HEX_COLOR_RE.match(hex_value)
+
+    if match is None:
+        raise ValueError("'%s' is not a valid hexadecimal color value." % hex_value)
 
-    else:
-        return usb.core.find(find_all=find_all, idVendor=VENDOR_ID, idProduct=PRODUCT_ID)
+    hex_digits = match.group(1)
+    if len(hex_digits) == 3:
+        hex_digits = ''.join([2 * s for s in hex_digits])
+
+    return int(hex_digits[0:2], 16), int(hex_digits[2:4], 16), int(hex_digits[4:6], 16)
+
+
+def _find_blicksticks(find_all=True):
+    return find_devices(find_all=find_all)
 
 
-def get_all(blinkstick=BlinkStick):
+def get_all(blinkstick=BlinkStick, lazy=False):
     """
     Find all attached BlinkStick devices.
 
+    @type  lazy: bool
+    @param lazy: do not open the devices and read their serial numbers until they are first used
     @rtype: BlinkStick[]
     @return: a list of BlinkStick objects or None if no devices found
     """
     result = []
     for device in _find_blicksticks():
-        result.extend([blinkstick(device=device)])
+        result.extend([blinkstick(device=device, lazy=lazy)])
 
     return result
 
 
-def get_first(blinkstick=BlinkStick):
+def get_first(blinkstick=BlinkStick, lazy=False):
     """
     Find first attached BlinkStick.
 
+    @type  lazy: bool
+    @param lazy: do not open the device and read its serial number until it is first used
     @rtype: BlinkStick
     @return: BlinkStick object or None if no devices are found
     """
     device = _find_blicksticks(find_all=False)
 
     if device:
-        return blinkstick(device=device)
+        return blinkstick(device=device, lazy=lazy)
 
 
 def get_by_serial(serial=None):
@@ -973,21 +1562,37 @@ def get_by_serial(serial=None):
     @return: BlinkStick object or None if no devices are found
     """
 
-    devices = []
-    if sys.platform == "win32":
-        devices = [d for d in _find_blicksticks()
-                   if d.serial_number == serial]
-    else:
-        for d in _find_blicksticks():
-            try:
-                if usb.util.get_string(d, 3) == serial:
-                    devices = [d]
-                    break
-            except Exception as e:
-                print("{0}".format(e))
+    device = find_device_by_serial(serial)
+
+    if device:
+        return BlinkStick(device=device)
+
+
+_ZEROS = memoryview(bytes(64 * 3))
+_ONES = memoryview(b'\x01' * 64)
+
+
+def _led_data_view(data):
+    view = memoryview(data)
+
+    if view.itemsize == 1:
+        if not view.contiguous:
+            view = memoryview(view.tobytes())
+
+        return view.cast('B')
 
-    if devices:
-        return BlinkStick(device=devices[0])
+    # wider items such as array('H') or int64 NumPy arrays hold one value per item,
+    # their raw bytes are not LED data
+    values = view.tolist()
+    while values and isinstance(values[0], list):
+        values = [value for row in values for value in row]
+
+    return bytearray(values)
+
+
+def _transfer_cost(length):
+    # Control transfers to the device are carried in 8 byte packets, framed by a setup and a status stage
+    return 2 + (length + 7) // 8
 
 
 def blinkstick_remap(value, left_min, left_max, right_min, right_max):
@@ -1002,7 +1607,25 @@ def blinkstick_remap(value, left_min, left_max, right_min, right_max):
     return int(right_min + (value_scaled * right))
 
 
+@functools.lru_cache(maxsize=16)
+def _remap_table(max_value):
+    # blinkstick_remap_color for every 0..255 value
+    return tuple([blinkstick_remap(value, 0, 255, 0, max_value) for value in range(256)])
+
+
+@functools.lru_cache(maxsize=16)
+def blinkstick_remap_table(max_value):
+    # translation table for bytes.translate, remaps every byte like blinkstick_remap_color
+    return bytes(_remap_table(max_value))
+
+
 def blinkstick_remap_color(value, max_value):
+    try:
+        if value >= 0:
+            return _remap_table(max_value)[value]
+    except (IndexError, TypeError):
+        pass
+
     return blinkstick_remap(value, 0, 255, 0, max_value)
 
 
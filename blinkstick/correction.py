@@ -0,0 +1,116 @@
+import threading
+
+"""
+Output color correction for L{BlinkStick} and L{BlinkStickPro} devices.
+"""
+
+
+class ColorCorrection(object):
+    """
+    Correction applied to colors as they are sent to the device. Brightness limit, gamma,
+    white balance and inversion are compiled into one 256 byte lookup table per color
+    component, so correcting a whole LED data frame takes a single translate pass per
+    component and the colors kept by the application stay uncorrected.
+
+        >>> correction = ColorCorrection(brightness=128, gamma=2.2, white_balance=(1.0, 0.8, 0.7))
+        >>> bstick.set_color_correction(correction)
+
+    Each output value is computed as::
+
+        brightness * white_balance * (value / 255) ** gamma
+
+    and subtracted from 255 when inverse is set.
+    """
+
+    def __init__(self, brightness=255, gamma=1.0, white_balance=(1.0, 1.0, 1.0), inverse=False):
+        """
+        Constructor for the class.
+
+        @type  brightness: int
+        @param brightness: 0..255 maximum output value
+        @type  gamma: float or (float, float, float)
+        @param gamma: gamma exponent for all components or separate R, G and B exponents
+        @type  white_balance: (float, float, float)
+        @param white_balance: 0.0..1.0 gain of the R, G and B components
+        @type  inverse: bool
+        @param inverse: invert the output values
+        """
+        if not isinstance(gamma, (list, tuple)):
+            gamma = (gamma, gamma, gamma)
+
+        self.brightness = brightness
+        self.gamma = tuple(gamma)
+        self.white_balance = tuple(white_balance)
+        self.inverse = inverse
+
+        self.red_table, self.green_table, self.blue_table = [
+            _build_table(brightness * gain, exponent, inverse)
+            for gain, exponent in zip(self.white_balance, self.gamma)]
+
+        # LED data frames are in GRB order
+        self._frame_tables = (self.green_table, self.red_table, self.blue_table)
+        self._uniform = self.red_table == self.green_table == self.blue_table
+
+        # corrected reports are written into buffers reused per thread, as a correction can be
+        # shared by devices sending from several threads
+        self._local = threading.local()
+
+    def correct_rgb(self, r, g, b):
+        """
+        Correct a single color.
+
+        @type  r: int
+        @param r: 0..255 red value
+        @type  g: int
+        @param g: 0..255 green value
+        @type  b: int
+        @param b: 0..255 blue value
+        @rtype: (int, int, int)
+        @return: corrected R, G and B values
+        """
+        return self.red_table[r], self.green_table[g], self.blue_table[b]
+
+    def correct_report(self, report, offset=2):
+        """
+        Correct the LED data in a report.
+
+        @type  report: bytearray
+        @param report: report with LED data in GRB format
+        @type  offset: int
+        @param offset: position of the first LED in the report
+        @rtype: bytearray
+        @return: report with the corrected LED data. The buffer is reused by the next call for a
+            report with the same id and length from the same thread.
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+
+        key = (report[0], len(report))
+        corrected = buffers.get(key)
+        if corrected is None:
+            corrected = buffers[key] = bytearray(len(report))
+
+        if self._uniform:
+            corrected[:] = report.translate(self.red_table)
+        else:
+            corrected[:] = report
+            for component, table in enumerate(self._frame_tables):
+                start = offset + component
+                corrected[start::3] = report[start::3].translate(table)
+
+        corrected[0:offset] = report[0:offset]
+
+        return corrected
+
+
+def _build_table(scale, gamma, inverse):
+    table = bytearray(256)
+
+    for value in range(256):
+        corrected = int(round(scale * (value / 255.0) ** gamma))
+        corrected = min(max(corrected, 0), 255)
+
+        table[value] = 255 - corrected if inverse else corrected
+
+    return bytes(table)
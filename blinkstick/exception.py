@@ -1,2 +1,9 @@
 class BlinkStickException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class BlinkStickTransportException(BlinkStickException):
+    """
+    Raised by transports when a transfer to or from the device fails.
+    """
+    pass
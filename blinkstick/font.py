@@ -0,0 +1,322 @@
+"""
+Bitmap fonts for drawing text on L{BlinkStickProMatrix}.
+"""
+
+
+class BitmapFont(object):
+    """
+    Fixed width bitmap font. Each glyph is stored as one bit mask per row, where the most
+    significant of the width bits is the leftmost pixel. The pixels and columns of the glyphs
+    are computed when they are first drawn and cached, so drawing the same characters again
+    does not decode the glyphs again.
+
+    The built-in fonts are L{FONT_3X5}, with digits and upper case letters, and L{FONT_5X7},
+    with all printable ASCII characters. Larger sizes are made with L{scaled}:
+
+        >>> matrix.draw_text(0, 0, "12:30", 255, 0, 0, font=FONT_5X7.scaled(2))
+    """
+
+    def __init__(self, width, height, glyphs, default='?'):
+        """
+        Constructor for the class.
+
+        @type width: int
+        @param width: width of the glyphs in pixels
+        @type height: int
+        @param height: height of the glyphs in pixels
+        @type glyphs: dict
+        @param glyphs: tuple of row bit masks keyed by character
+        @type default: str
+        @param default: character drawn for characters missing from the font
+        """
+        self.width = width
+        self.height = height
+        self.glyphs = glyphs
+        self.default = default
+
+        self._pixels = {}
+        self._columns = {}
+        self._scaled = {}
+
+    def glyph(self, char):
+        """
+        Get the row bit masks of a character. Lower case letters missing from the font are
+        drawn as upper case letters.
+
+        @type char: str
+        @param char: the character
+        @rtype: tuple
+        @return: one bit mask per row
+        """
+        glyph = self.glyphs.get(char)
+
+        if glyph is None:
+            glyph = self.glyphs.get(char.upper())
+
+        if glyph is None:
+            glyph = self.glyphs.get(self.default, (0,) * self.height)
+
+        return glyph
+
+    def pixels(self, char):
+        """
+        Get the pixels of a character which are lit.
+
+        @type char: str
+        @param char: the character
+        @rtype: tuple
+        @return: (x, y) positions relative to the top left corner of the glyph
+        """
+        pixels = self._pixels.get(char)
+
+        if pixels is None:
+            glyph = self.glyph(char)
+            pixels = self._pixels[char] = tuple((x, y) for y in range(0, self.height) for x in range(0, self.width)
+                                                if glyph[y] >> (self.width - 1 - x) & 1)
+
+        return pixels
+
+    def columns(self, char):
+        """
+        Get the columns of a character as bit masks where bit n is the pixel on row n.
+
+        @type char: str
+        @param char: the character
+        @rtype: tuple
+        @return: one bit mask per column
+        """
+        columns = self._columns.get(char)
+
+        if columns is None:
+            glyph = self.glyph(char)
+            columns = self._columns[char] = tuple(
+                sum(1 << y for y in range(0, self.height) if glyph[y] >> (self.width - 1 - x) & 1)
+                for x in range(0, self.width))
+
+        return columns
+
+    def text_width(self, text, spacing=1):
+        """
+        Get the width of a text in pixels.
+
+        @type text: str
+        @param text: the text
+        @type spacing: int
+        @param spacing: number of blank columns between characters
+        @rtype: int
+        @return: width in pixels
+        """
+        if not text:
+            return 0
+
+        return len(text) * (self.width + spacing) - spacing
+
+    def scaled(self, factor):
+        """
+        Get this font with every pixel drawn as a factor x factor square.
+
+        @type factor: int
+        @param factor: scale factor
+        @rtype: BitmapFont
+        @return: the scaled font
+        """
+        if factor == 1:
+            return self
+
+        font = self._scaled.get(factor)
+
+        if font is None:
+            glyphs = {}
+            for char, glyph in self.glyphs.items():
+                rows = []
+                for row in glyph:
+                    scaled_row = 0
+                    for x in range(0, self.width):
+                        bit = row >> (self.width - 1 - x) & 1
+                        scaled_row = (scaled_row << factor) | (((1 << factor) - 1) if bit else 0)
+                    rows.extend([scaled_row] * factor)
+                glyphs[char] = tuple(rows)
+
+            font = self._scaled[factor] = BitmapFont(self.width * factor, self.height * factor, glyphs, self.default)
+
+        return font
+
+
+def _from_rows(width, height, table):
+    # glyphs drawn as strings of '1' and '0', one per row
+    return BitmapFont(width, height, dict((char, tuple(int(row, 2) for row in rows)) for char, rows in table.items()))
+
+
+def _from_columns(width, height, first, table):
+    # glyphs as one byte per column where bit n is the pixel on row n, for consecutive characters
+    glyphs = {}
+
+    for i, columns in enumerate(table):
+        glyphs[chr(first + i)] = tuple(
+            sum(1 << (width - 1 - x) for x in range(0, width) if columns[x] >> y & 1)
+            for y in range(0, height))
+
+    return BitmapFont(width, height, glyphs)
+
+
+FONT_3X5 = _from_rows(3, 5, {
+    ' ': ('000', '000', '000', '000', '000'),
+    '!': ('010', '010', '010', '000', '010'),
+    '"': ('101', '101', '000', '000', '000'),
+    '#': ('101', '111', '101', '111', '101'),
+    '%': ('101', '001', '010', '100', '101'),
+    "'": ('010', '010', '000', '000', '000'),
+    '(': ('001', '010', '010', '010', '001'),
+    ')': ('100', '010', '010', '010', '100'),
+    '*': ('000', '101', '010', '101', '000'),
+    '+': ('000', '010', '111', '010', '000'),
+    ',': ('000', '000', '000', '010', '100'),
+    '-': ('000', '000', '111', '000', '000'),
+    '.': ('000', '000', '000', '000', '010'),
+    '/': ('001', '001', '010', '100', '100'),
+    '0': ('111', '101', '101', '101', '111'),
+    '1': ('010', '110', '010', '010', '111'),
+    '2': ('111', '001', '111', '100', '111'),
+    '3': ('111', '001', '111', '001', '111'),
+    '4': ('101', '101', '111', '001', '001'),
+    '5': ('111', '100', '111', '001', '111'),
+    '6': ('111', '100', '111', '101', '111'),
+    '7': ('111', '001', '010', '010', '010'),
+    '8': ('111', '101', '111', '101', '111'),
+    '9': ('111', '101', '111', '001', '111'),
+    ':': ('000', '010', '000', '010', '000'),
+    ';': ('000', '010', '000', '010', '100'),
+    '<': ('001', '010', '100', '010', '001'),
+    '=': ('000', '111', '000', '111', '000'),
+    '>': ('100', '010', '001', '010', '100'),
+    '?': ('111', '001', '010', '000', '010'),
+    'A': ('010', '101', '111', '101', '101'),
+    'B': ('110', '101', '110', '101', '110'),
+    'C': ('011', '100', '100', '100', '011'),
+    'D': ('110', '101', '101', '101', '110'),
+    'E': ('111', '100', '110', '100', '111'),
+    'F': ('111', '100', '110', '100', '100'),
+    'G': ('011', '100', '101', '101', '011'),
+    'H': ('101', '101', '111', '101', '101'),
+    'I': ('111', '010', '010', '010', '111'),
+    'J': ('001', '001', '001', '101', '010'),
+    'K': ('101', '101', '110', '101', '101'),
+    'L': ('100', '100', '100', '100', '111'),
+    'M': ('101', '111', '111', '101', '101'),
+    'N': ('110', '101', '101', '101', '101'),
+    'O': ('010', '101', '101', '101', '010'),
+    'P': ('110', '101', '110', '100', '100'),
+    'Q': ('010', '101', '101', '110', '011'),
+    'R': ('110', '101', '110', '101', '101'),
+    'S': ('011', '100', '010', '001', '110'),
+    'T': ('111', '010', '010', '010', '010'),
+    'U': ('101', '101', '101', '101', '111'),
+    'V': ('101', '101', '101', '101', '010'),
+    'W': ('101', '101', '111', '111', '101'),
+    'X': ('101', '101', '010', '101', '101'),
+    'Y': ('101', '101', '010', '010', '010'),
+    'Z': ('111', '001', '010', '100', '111'),
+    '[': ('011', '010', '010', '010', '011'),
+    '\\': ('100', '100', '010', '001', '001'),
+    ']': ('110', '010', '010', '010', '110'),
+    '^': ('010', '101', '000', '000', '000'),
+    '_': ('000', '000', '000', '000', '111'),
+})
+
+FONT_5X7 = _from_columns(5, 7, 0x20, [
+    (0x00, 0x00, 0x00, 0x00, 0x00),  # space
+    (0x00, 0x00, 0x5F, 0x00, 0x00),  # !
+    (0x00, 0x07, 0x00, 0x07, 0x00),  # "
+    (0x14, 0x7F, 0x14, 0x7F, 0x14),  # #
+    (0x24, 0x2A, 0x7F, 0x2A, 0x12),  # $
+    (0x23, 0x13, 0x08, 0x64, 0x62),  # %
+    (0x36, 0x49, 0x55, 0x22, 0x50),  # &
+    (0x00, 0x05, 0x03, 0x00, 0x00),  # '
+    (0x00, 0x1C, 0x22, 0x41, 0x00),  # (
+    (0x00, 0x41, 0x22, 0x1C, 0x00),  # )
+    (0x14, 0x08, 0x3E, 0x08, 0x14),  # *
+    (0x08, 0x08, 0x3E, 0x08, 0x08),  # +
+    (0x00, 0x50, 0x30, 0x00, 0x00),  # ,
+    (0x08, 0x08, 0x08, 0x08, 0x08),  # -
+    (0x00, 0x60, 0x60, 0x00, 0x00),  # .
+    (0x20, 0x10, 0x08, 0x04, 0x02),  # /
+    (0x3E, 0x51, 0x49, 0x45, 0x3E),  # 0
+    (0x00, 0x42, 0x7F, 0x40, 0x00),  # 1
+    (0x42, 0x61, 0x51, 0x49, 0x46),  # 2
+    (0x21, 0x41, 0x45, 0x4B, 0x31),  # 3
+    (0x18, 0x14, 0x12, 0x7F, 0x10),  # 4
+    (0x27, 0x45, 0x45, 0x45, 0x39),  # 5
+    (0x3C, 0x4A, 0x49, 0x49, 0x30),  # 6
+    (0x01, 0x71, 0x09, 0x05, 0x03),  # 7
+    (0x36, 0x49, 0x49, 0x49, 0x36),  # 8
+    (0x06, 0x49, 0x49, 0x29, 0x1E),  # 9
+    (0x00, 0x36, 0x36, 0x00, 0x00),  # :
+    (0x00, 0x56, 0x36, 0x00, 0x00),  # ;
+    (0x08, 0x14, 0x22, 0x41, 0x00),  # <
+    (0x14, 0x14, 0x14, 0x14, 0x14),  # =
+    (0x00, 0x41, 0x22, 0x14, 0x08),  # >
+    (0x02, 0x01, 0x51, 0x09, 0x06),  # ?
+    (0x32, 0x49, 0x79, 0x41, 0x3E),  # @
+    (0x7E, 0x11, 0x11, 0x11, 0x7E),  # A
+    (0x7F, 0x49, 0x49, 0x49, 0x36),  # B
+    (0x3E, 0x41, 0x41, 0x41, 0x22),  # C
+    (0x7F, 0x41, 0x41, 0x22, 0x1C),  # D
+    (0x7F, 0x49, 0x49, 0x49, 0x41),  # E
+    (0x7F, 0x09, 0x09, 0x09, 0x01),  # F
+    (0x3E, 0x41, 0x49, 0x49, 0x7A),  # G
+    (0x7F, 0x08, 0x08, 0x08, 0x7F),  # H
+    (0x00, 0x41, 0x7F, 0x41, 0x00),  # I
+    (0x20, 0x40, 0x41, 0x3F, 0x01),  # J
+    (0x7F, 0x08, 0x14, 0x22, 0x41),  # K
+    (0x7F, 0x40, 0x40, 0x40, 0x40),  # L
+    (0x7F, 0x02, 0x0C, 0x02, 0x7F),  # M
+    (0x7F, 0x04, 0x08, 0x10, 0x7F),  # N
+    (0x3E, 0x41, 0x41, 0x41, 0x3E),  # O
+    (0x7F, 0x09, 0x09, 0x09, 0x06),  # P
+    (0x3E, 0x41, 0x51, 0x21, 0x5E),  # Q
+    (0x7F, 0x09, 0x19, 0x29, 0x46),  # R
+    (0x46, 0x49, 0x49, 0x49, 0x31),  # S
+    (0x01, 0x01, 0x7F, 0x01, 0x01),  # T
+    (0x3F, 0x40, 0x40, 0x40, 0x3F),  # U
+    (0x1F, 0x20, 0x40, 0x20, 0x1F),  # V
+    (0x3F, 0x40, 0x38, 0x40, 0x3F),  # W
+    (0x63, 0x14, 0x08, 0x14, 0x63),  # X
+    (0x07, 0x08, 0x70, 0x08, 0x07),  # Y
+    (0x61, 0x51, 0x49, 0x45, 0x43),  # Z
+    (0x00, 0x7F, 0x41, 0x41, 0x00),  # [
+    (0x02, 0x04, 0x08, 0x10, 0x20),  # backslash
+    (0x00, 0x41, 0x41, 0x7F, 0x00),  # ]
+    (0x04, 0x02, 0x01, 0x02, 0x04),  # ^
+    (0x40, 0x40, 0x40, 0x40, 0x40),  # _
+    (0x00, 0x01, 0x02, 0x04, 0x00),  # `
+    (0x20, 0x54, 0x54, 0x54, 0x78),  # a
+    (0x7F, 0x48, 0x44, 0x44, 0x38),  # b
+    (0x38, 0x44, 0x44, 0x44, 0x20),  # c
+    (0x38, 0x44, 0x44, 0x48, 0x7F),  # d
+    (0x38, 0x54, 0x54, 0x54, 0x18),  # e
+    (0x08, 0x7E, 0x09, 0x01, 0x02),  # f
+    (0x0C, 0x52, 0x52, 0x52, 0x3E),  # g
+    (0x7F, 0x08, 0x04, 0x04, 0x78),  # h
+    (0x00, 0x44, 0x7D, 0x40, 0x00),  # i
+    (0x20, 0x40, 0x44, 0x3D, 0x00),  # j
+    (0x7F, 0x10, 0x28, 0x44, 0x00),  # k
+    (0x00, 0x41, 0x7F, 0x40, 0x00),  # l
+    (0x7C, 0x04, 0x18, 0x04, 0x78),  # m
+    (0x7C, 0x08, 0x04, 0x04, 0x78),  # n
+    (0x38, 0x44, 0x44, 0x44, 0x38),  # o
+    (0x7C, 0x14, 0x14, 0x14, 0x08),  # p
+    (0x08, 0x14, 0x14, 0x18, 0x7C),  # q
+    (0x7C, 0x08, 0x04, 0x04, 0x08),  # r
+    (0x48, 0x54, 0x54, 0x54, 0x20),  # s
+    (0x04, 0x3F, 0x44, 0x40, 0x20),  # t
+    (0x3C, 0x40, 0x40, 0x20, 0x7C),  # u
+    (0x1C, 0x20, 0x40, 0x20, 0x1C),  # v
+    (0x3C, 0x40, 0x30, 0x40, 0x3C),  # w
+    (0x44, 0x28, 0x10, 0x28, 0x44),  # x
+    (0x0C, 0x50, 0x50, 0x50, 0x3C),  # y
+    (0x44, 0x64, 0x54, 0x4C, 0x44),  # z
+    (0x00, 0x08, 0x36, 0x41, 0x00),  # {
+    (0x00, 0x00, 0x7F, 0x00, 0x00),  # |
+    (0x00, 0x41, 0x36, 0x08, 0x00),  # }
+    (0x08, 0x04, 0x08, 0x10, 0x08),  # ~
+])
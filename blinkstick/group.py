@@ -0,0 +1,191 @@
+from blinkstick.blinkstick import BlinkStick, get_all, get_by_serial
+from blinkstick.exception import BlinkStickException
+
+from concurrent.futures import ThreadPoolExecutor
+import operator
+
+"""
+Control several BlinkStick devices at the same time.
+"""
+
+
+class GroupResult(object):
+    """
+    Outcome of a command sent to every device of a L{DeviceGroup}. Results and errors are keyed
+    by the position of the device in L{DeviceGroup.devices}.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def ok(self):
+        """
+        @rtype: bool
+        @return: True if the command succeeded on every device
+        """
+        return not self.errors
+
+    def raise_errors(self):
+        """
+        Raise L{BlinkStickException} if the command failed on any of the devices.
+        """
+        if self.errors:
+            raise BlinkStickException("Command failed on {0} device(s): {1}".format(
+                len(self.errors), ", ".join("device {0}: {1}".format(position, error)
+                                            for position, error in sorted(self.errors.items()))))
+
+
+class DeviceGroup(object):
+    """
+    Group of BlinkStick devices which are sent the same commands in parallel. Every command is
+    run on a thread pool with one thread per device, so a broadcast takes about as long as it
+    takes for one device instead of the sum of all of them.
+
+        >>> group = DeviceGroup.from_all()
+        >>> result = group.set_color(name="red")
+        >>> result.raise_errors()
+        >>> group.pulse(name="blue")
+
+    Commands return a L{GroupResult} with the result and the error of each device keyed by its
+    position in L{devices}. Serial numbers are not used as keys, as reading them needs a transfer
+    to every device and opens lazily created devices.
+    """
+
+    def __init__(self, devices, max_workers=None):
+        """
+        Constructor for the class.
+
+        @type  devices: list
+        @param devices: BlinkStick objects to control
+        @type  max_workers: int
+        @param max_workers: maximum number of devices to send commands to at the same time,
+            by default all of them
+        """
+        self.devices = list(devices)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(len(self.devices), 1),
+                                            thread_name_prefix="BlinkStick group")
+
+    @classmethod
+    def from_all(cls, blinkstick=BlinkStick, max_workers=None):
+        """
+        Create a group of all attached BlinkStick devices.
+
+        @type  blinkstick: class
+        @param blinkstick: class of the device objects to create
+        @type  max_workers: int
+        @param max_workers: see L{__init__}
+        @rtype: DeviceGroup
+        @return: group of the devices found
+        """
+        return cls(get_all(blinkstick), max_workers=max_workers)
+
+    @classmethod
+    def from_serials(cls, serials, max_workers=None):
+        """
+        Create a group of the BlinkStick devices with the given serial numbers.
+
+        @type  serials: list
+        @param serials: serial numbers of the devices
+        @type  max_workers: int
+        @param max_workers: see L{__init__}
+        @rtype: DeviceGroup
+        @return: group of the devices
+        @raise BlinkStickException: if any of the devices is not found
+        """
+        devices = []
+        missing = []
+
+        for serial in serials:
+            device = get_by_serial(serial)
+
+            if device is None:
+                missing.append(serial)
+            else:
+                devices.append(device)
+
+        if missing:
+            raise BlinkStickException("BlinkStick device(s) not found: {0}".format(", ".join(missing)))
+
+        return cls(devices, max_workers=max_workers)
+
+    def run(self, function, *args, **kwargs):
+        """
+        Call a function for every device in parallel and wait for all of them to finish.
+
+            >>> group.run(BlinkStick.set_color, name="red")
+
+        @param function: function called with the device followed by the other arguments
+        @rtype: GroupResult
+        @return: result and errors of the calls
+        """
+        futures = [self._executor.submit(function, device, *args, **kwargs) for device in self.devices]
+
+        result = GroupResult()
+        for position, future in enumerate(futures):
+            try:
+                result.results[position] = future.result()
+            except Exception as e:
+                result.errors[position] = e
+
+        return result
+
+    def _call(self, method, *args, **kwargs):
+        # look the method up on each device so that subclasses of BlinkStick are honoured
+        return self.run(operator.methodcaller(method, *args, **kwargs))
+
+    def set_color(self, *args, **kwargs):
+        """
+        Set the color of all devices, see L{BlinkStick.set_color}.
+
+        @rtype: GroupResult
+        """
+        return self._call('set_color', *args, **kwargs)
+
+    def set_led_data(self, channel, data, force=False):
+        """
+        Send the same LED data frame to all devices, see L{BlinkStick.set_led_data}.
+
+        @rtype: GroupResult
+        """
+        return self._call('set_led_data', channel, data, force)
+
+    def morph(self, *args, **kwargs):
+        """
+        Morph the color of all devices at the same time, see L{BlinkStick.morph}.
+
+        @rtype: GroupResult
+        """
+        return self._call('morph', *args, **kwargs)
+
+    def pulse(self, *args, **kwargs):
+        """
+        Pulse the color of all devices at the same time, see L{BlinkStick.pulse}.
+
+        @rtype: GroupResult
+        """
+        return self._call('pulse', *args, **kwargs)
+
+    def blink(self, *args, **kwargs):
+        """
+        Blink all devices at the same time, see L{BlinkStick.blink}.
+
+        @rtype: GroupResult
+        """
+        return self._call('blink', *args, **kwargs)
+
+    def turn_off(self):
+        """
+        Turn off all devices, see L{BlinkStick.turn_off}.
+
+        @rtype: GroupResult
+        """
+        return self._call('turn_off')
+
+    def close(self):
+        """
+        Stop the threads of the group.
+        """
+        self._executor.shutdown()
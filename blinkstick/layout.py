@@ -0,0 +1,144 @@
+from blinkstick.exception import BlinkStickException
+
+"""
+Wiring layouts of LED panels connected to L{BlinkStickProMatrix}.
+"""
+
+
+class PanelLayout(object):
+    """
+    Describes how the LEDs of a panel are wired and where the panel is placed in the matrix.
+
+    The LEDs of an unrotated panel are wired row after row starting at the top left corner.
+    Serpentine panels run every other row from right to left, as most NeoPixel panels do.
+    The flips mirror the wiring of the panel and the rotation turns the panel clockwise as it
+    is mounted, so a 8x4 panel rotated by 90 degrees covers 8 columns and 4 rows of the
+    matrix but is wired as 4 columns and 8 rows.
+
+        >>> matrix = BlinkStickProMatrix(r_columns=8, r_rows=8,
+        ...                              layouts={0: PanelLayout(serpentine=True, rotation=180)})
+
+    Several panels chained to the same channel are given as a list of layouts in the order
+    they are wired.
+    """
+
+    def __init__(self, columns=None, rows=None, x=None, y=None, serpentine=False, rotation=0, flip_x=False,
+                 flip_y=False):
+        """
+        Constructor for the class.
+
+        @type columns: int
+        @param columns: number of matrix columns covered by the panel, by default all columns of the channel
+        @type rows: int
+        @param rows: number of matrix rows covered by the panel, by default all rows of the channel
+        @type x: int
+        @param x: matrix column of the left side of the panel, by default the first column of the
+            channel or the column after the previous panel on the channel
+        @type y: int
+        @param y: matrix row of the top of the panel, 0 by default
+        @type serpentine: bool
+        @param serpentine: every other row of LEDs is wired from right to left
+        @type rotation: int
+        @param rotation: 0, 90, 180 or 270 degrees clockwise rotation of the panel
+        @type flip_x: bool
+        @param flip_x: mirror the wiring of the panel horizontally
+        @type flip_y: bool
+        @param flip_y: mirror the wiring of the panel vertically
+        """
+        if rotation not in (0, 90, 180, 270):
+            raise BlinkStickException("Panel rotation must be 0, 90, 180 or 270 degrees")
+
+        self.columns = columns
+        self.rows = rows
+        self.x = x
+        self.y = y
+        self.serpentine = serpentine
+        self.rotation = rotation
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+
+    def wire_order(self, columns, rows):
+        """
+        Get the position of each LED of the panel in the order the LEDs are wired.
+
+        @type columns: int
+        @param columns: number of matrix columns covered by the panel
+        @type rows: int
+        @param rows: number of matrix rows covered by the panel
+        @rtype: list
+        @return: list of (x, y) positions relative to the top left corner of the panel
+        """
+        if self.rotation in (90, 270):
+            width, height = rows, columns
+        else:
+            width, height = columns, rows
+
+        positions = []
+
+        for wire_y in range(0, height):
+            panel_y = height - 1 - wire_y if self.flip_y else wire_y
+
+            wire_xs = range(0, width)
+            if self.serpentine and wire_y % 2:
+                wire_xs = reversed(wire_xs)
+
+            for wire_x in wire_xs:
+                panel_x = width - 1 - wire_x if self.flip_x else wire_x
+                positions.append(_rotate(panel_x, panel_y, width, height, self.rotation))
+
+        return positions
+
+
+def _rotate(x, y, width, height, rotation):
+    # clockwise rotation of a position in a width x height panel
+    if rotation == 90:
+        return height - 1 - y, x
+    elif rotation == 180:
+        return width - 1 - x, height - 1 - y
+    elif rotation == 270:
+        return y, width - 1 - x
+
+    return x, y
+
+
+def compile_layout(panels, x, columns, rows, matrix_columns, matrix_rows):
+    """
+    Build the map from the LED data of a channel to the matrix data.
+
+    @type panels: list
+    @param panels: L{PanelLayout} of each panel on the channel in the order they are wired
+    @type x: int
+    @param x: first matrix column of the channel
+    @type columns: int
+    @param columns: number of matrix columns of the channel
+    @type rows: int
+    @param rows: number of matrix rows of the channel
+    @type matrix_columns: int
+    @param matrix_columns: number of columns of the matrix
+    @type matrix_rows: int
+    @param matrix_rows: number of rows of the matrix
+    @rtype: list
+    @return: index in the GRB matrix data of every byte of the LED data of the channel
+    """
+    indices = []
+    panel_x = x
+
+    for panel in panels:
+        panel_columns = panel.columns if panel.columns is not None else columns
+        panel_rows = panel.rows if panel.rows is not None else rows
+        panel_x = panel.x if panel.x is not None else panel_x
+        panel_y = panel.y if panel.y is not None else 0
+
+        for led_x, led_y in panel.wire_order(panel_columns, panel_rows):
+            matrix_x = panel_x + led_x
+            matrix_y = panel_y + led_y
+
+            if not (0 <= matrix_x < matrix_columns and 0 <= matrix_y < matrix_rows):
+                raise BlinkStickException("Panel LED at {0}:{1} is outside of the matrix".format(matrix_x, matrix_y))
+
+            offset = (matrix_y * matrix_columns + matrix_x) * 3
+            indices.extend((offset, offset + 1, offset + 2))
+
+        panel_x += panel_columns
+
+    return indices
@@ -0,0 +1,121 @@
+import bisect
+import threading
+
+"""
+Transfer instrumentation for L{BlinkStick} devices.
+"""
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket has no upper bound
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class TransferMetrics(object):
+    """
+    Counters and latency histograms of the transfers made by a L{BlinkStick}. Enable them with
+    L{BlinkStick.enable_metrics} and read them with L{BlinkStick.get_metrics}.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Set all counters to zero.
+        """
+        with self._lock:
+            self.transfers = {}
+            self.latencies = {}
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.errors = 0
+            self.retries = 0
+            self.reconnects = 0
+            self.errors_swallowed = 0
+            self.writes_dropped = 0
+
+    def record_transfer(self, report_id, bytes_sent, bytes_received, latency):
+        """
+        Record a completed transfer.
+
+        @type  report_id: int
+        @param report_id: HID report id
+        @type  bytes_sent: int
+        @param bytes_sent: number of bytes written to the device
+        @type  bytes_received: int
+        @param bytes_received: number of bytes read from the device
+        @type  latency: float
+        @param latency: duration of the transfer in seconds
+        """
+        with self._lock:
+            self.transfers[report_id] = self.transfers.get(report_id, 0) + 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+            histogram = self.latencies.get(report_id)
+            if histogram is None:
+                histogram = self.latencies[report_id] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+            histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_error(self):
+        """
+        Record a transfer which failed.
+        """
+        with self._lock:
+            self.errors += 1
+
+    def record_retry(self):
+        """
+        Record an attempt to repeat a failed transfer.
+        """
+        with self._lock:
+            self.retries += 1
+
+    def record_reconnect(self):
+        """
+        Record a successful reconnect to the device.
+        """
+        with self._lock:
+            self.reconnects += 1
+
+    def record_swallowed_error(self):
+        """
+        Record an error which was not reported because error reporting is disabled.
+        """
+        with self._lock:
+            self.errors_swallowed += 1
+
+    def record_dropped_write(self):
+        """
+        Record a write which was dropped because the circuit breaker is open.
+        """
+        with self._lock:
+            self.writes_dropped += 1
+
+    def snapshot(self):
+        """
+        Get a copy of all counters.
+
+        The latency histograms are keyed by report id. Each histogram is a list of
+        (upper bound in seconds, count) pairs where the last upper bound is None.
+
+        @rtype: dict
+        @return: dictionary with "transfers", "bytes_sent", "bytes_received", "errors",
+            "retries", "reconnects", "errors_swallowed", "writes_dropped" and "latency" keys
+        """
+        bounds = LATENCY_BUCKETS + (None,)
+
+        with self._lock:
+            return {
+                "transfers": dict(self.transfers),
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "errors": self.errors,
+                "retries": self.retries,
+                "reconnects": self.reconnects,
+                "errors_swallowed": self.errors_swallowed,
+                "writes_dropped": self.writes_dropped,
+                "latency": dict((report_id, list(zip(bounds, histogram)))
+                                for report_id, histogram in self.latencies.items()),
+            }
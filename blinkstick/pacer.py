@@ -0,0 +1,103 @@
+import time
+
+"""
+Frame rate control for L{BlinkStickPro} transmissions.
+"""
+
+
+class FramePacer(object):
+    """
+    Paces transmissions to reach a target frame rate. Each frame is split into one time slot per
+    channel. After a channel has been sent, the pacer only waits for what is left of its slot, so
+    the time the transfer took is not added on top of the delay. Slots are scheduled back to back
+    from deadline to deadline, so the frame rate does not drift.
+
+    A transmission which takes longer than its slot misses its deadline. The schedule then
+    restarts from the current time instead of trying to catch up.
+    """
+
+    def __init__(self, fps, channels=1):
+        """
+        Constructor for the class.
+
+        @type  fps: float
+        @param fps: target frames per second
+        @type  channels: int
+        @param channels: number of channels sent in each frame
+        """
+        self.fps = fps
+        self.channels = max(channels, 1)
+        self.budget = 1.0 / (fps * self.channels)
+
+        self.transmissions = 0
+        self.missed_deadlines = 0
+        self.max_lateness = 0.0
+
+        self._deadline = None
+
+    def get_delay(self, start, now=None):
+        """
+        Advance the schedule for a transmission and get the time left in its slot.
+
+        @type  start: float
+        @param start: time.perf_counter() value when the transmission started
+        @type  now: float
+        @param now: time.perf_counter() value when the transmission finished, defaults to now
+        @rtype: float
+        @return: time in seconds to wait before the next transmission
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        if self._deadline is None or start > self._deadline:
+            # nothing was sent for longer than a slot, start a new schedule
+            self._deadline = start
+
+        self._deadline += self.budget
+        self.transmissions += 1
+
+        remaining = self._deadline - now
+
+        if remaining < 0:
+            self.missed_deadlines += 1
+            self.max_lateness = max(self.max_lateness, -remaining)
+            self._deadline = now
+            return 0.0
+
+        return remaining
+
+    def wait(self, start):
+        """
+        Sleep for the time left in the slot of a transmission, see L{get_delay}.
+
+        @type  start: float
+        @param start: time.perf_counter() value when the transmission started
+        """
+        delay = self.get_delay(start)
+
+        if delay:
+            time.sleep(delay)
+
+    def get_stats(self):
+        """
+        Get the pacing statistics.
+
+        @rtype: dict
+        @return: dictionary with "fps", "transmissions", "missed_deadlines" and
+            "max_lateness" (in seconds) keys
+        """
+        return {
+            "fps": self.fps,
+            "transmissions": self.transmissions,
+            "missed_deadlines": self.missed_deadlines,
+            "max_lateness": self.max_lateness,
+        }
+
+    def reset(self):
+        """
+        Restart the schedule and set the statistics to zero.
+        """
+        self.transmissions = 0
+        self.missed_deadlines = 0
+        self.max_lateness = 0.0
+        self._deadline = None
@@ -1,4 +1,5 @@
-from blinkstick.blinkstick import get_first, get_by_serial, blinkstick_remap_color
+from blinkstick.blinkstick import BlinkStick, get_first, get_by_serial, blinkstick_remap_color
+from blinkstick.pacer import FramePacer
 
 import time
 
@@ -16,7 +17,7 @@ class BlinkStickPro(object):
     U{https://github.com/arvydas/blinkstick-python/wiki#code-examples-for-blinkstick-pro}
     """
 
-    def __init__(self, r_led_count=0, g_led_count=0, b_led_count=0, delay=0.002, max_rgb_value=255):
+    def __init__(self, r_led_count=0, g_led_count=0, b_led_count=0, delay=0.002, max_rgb_value=255, fps=None):
         """
         Initialize BlinkStickPro class.
 
@@ -30,6 +31,8 @@ class BlinkStickPro(object):
         @param delay: default transmission delay between frames
         @type max_rgb_value: int
         @param max_rgb_value: maximum color value for RGB channels
+        @type fps: float
+        @param fps: target frame rate, replaces the transmission delay when set, see L{set_fps}
         """
 
         self.r_led_count = r_led_count
@@ -42,21 +45,79 @@ class BlinkStickPro(object):
 
         self.max_rgb_value = max_rgb_value
 
-        # initialise data store for each channel
-        # pre-populated with zeroes
+        # initialise data store for each channel pre-populated with zeroes,
+        # each channel is kept in GRB format as it is sent to the device
 
-        self.data = [[], [], []]
+        self.data = [bytearray(r_led_count * 3), bytearray(g_led_count * 3), bytearray(b_led_count * 3)]
 
-        for i in range(0, r_led_count):
-            self.data[0].append([0, 0, 0])
+        self.bstick = None
 
-        for i in range(0, g_led_count):
-            self.data[1].append([0, 0, 0])
+        self.skip_redundant_writes = False
+        self.color_correction = None
 
-        for i in range(0, b_led_count):
-            self.data[2].append([0, 0, 0])
+        # per channel report buffers for pipelined transmissions
+        self.pipelined = False
+        self.frame_timing = None
+        self._reports = [bytearray(2 + 64 * 3) for i in range(3)]
 
-        self.bstick = None
+        self.pacer = None
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """
+        Pace L{send_data} to a target frame rate instead of sleeping for the transmission delay
+        after each channel. Each channel with LEDs gets an equal share of the frame time and
+        send_data only sleeps for what is left of it after the transfer. Missed deadlines are
+        counted in L{FramePacer.get_stats} of the L{pacer}.
+
+        When pipelined transmissions are enabled, the whole frame time is waited for once after
+        all channels have been sent, see L{set_pipelined}.
+
+        @type fps: float
+        @param fps: target frames per second, None to use the transmission delay
+        """
+        if fps:
+            channels = 1
+            if not self.pipelined:
+                channels = len(self._channels())
+
+            self.pacer = FramePacer(fps, channels)
+        else:
+            self.pacer = None
+
+    def set_pipelined(self, value):
+        """
+        Make L{send_data_all} encode the data of all channels up front and send the channels back
+        to back, waiting for the transmission delay or frame rate target once per frame instead of
+        after each channel. This keeps the time between channels of a frame as short as possible.
+        The timing of the last frame is available from L{get_frame_timing}.
+
+        @type value: bool
+        @param value: True/False to enable or disable pipelined transmissions
+        """
+        self.pipelined = value
+
+        if self.pacer is not None:
+            self.set_fps(self.pacer.fps)
+
+    def get_frame_timing(self):
+        """
+        Get the timing of the last frame sent with pipelined transmissions, see L{set_pipelined}.
+
+        The "channels" dictionary is keyed by channel and holds the "offset" of the start of the
+        transfer from the start of the frame, its "duration" and whether it was "sent" or skipped
+        as redundant. "skew" is the time between the starts of the first and the last channel.
+        All times are in seconds.
+
+        @rtype: dict
+        @return: dictionary with "channels", "skew" and "duration" keys, None if no frame has
+            been sent yet
+        """
+        return self.frame_timing
+
+    def _channels(self):
+        return [channel for channel, count in enumerate((self.r_led_count, self.g_led_count, self.b_led_count))
+                if count > 0]
 
     def set_color(self, channel, index, r, g, b, remap_values=True):
         """
@@ -77,9 +138,15 @@ class BlinkStickPro(object):
         """
 
         if remap_values:
-            r, g, b = [blinkstick_remap_color(val, self.max_rgb_value) for val in [r, g, b]]
+            r = blinkstick_remap_color(r, self.max_rgb_value)
+            g = blinkstick_remap_color(g, self.max_rgb_value)
+            b = blinkstick_remap_color(b, self.max_rgb_value)
 
-        self.data[channel][index] = [g, r, b]
+        data = self.data[channel]
+        offset = index * 3
+        data[offset] = g
+        data[offset + 1] = r
+        data[offset + 2] = b
 
     def get_color(self, channel, index):
         """
@@ -94,21 +161,32 @@ class BlinkStickPro(object):
         @return: 3-tuple for R, G and B values
         """
 
-        val = self.data[channel][index]
-        return [val[1], val[0], val[2]]
+        data = self.data[channel]
+        offset = index * 3
+        return [data[offset + 1], data[offset], data[offset + 2]]
+
+    def get_buffer(self, channel):
+        """
+        Get the frame buffer of a channel to write LED data directly. The buffer holds 3 bytes
+        per LED in GRB format, the order in which they are sent to the device. Values written
+        to it are not remapped to L{max_rgb_value}.
+
+            >>> buffer = pro.get_buffer(0)
+            >>> buffer[0:3] = bytes([255, 0, 0])  # first LED green
+
+        @type  channel: int
+        @param channel: the channel of the LEDs
+        @rtype: memoryview
+        @return: writable view of the frame buffer
+        """
+        return memoryview(self.data[channel])
 
     def clear(self):
         """
         Set all pixels to black in the frame buffer.
         """
-        for x in range(0, self.r_led_count):
-            self.set_color(0, x, 0, 0, 0)
-
-        for x in range(0, self.g_led_count):
-            self.set_color(1, x, 0, 0, 0)
-
-        for x in range(0, self.b_led_count):
-            self.set_color(2, x, 0, 0, 0)
+        for data in self.data:
+            data[:] = bytes(len(data))
 
     def off(self):
         """
@@ -117,22 +195,84 @@ class BlinkStickPro(object):
         self.clear()
         self.send_data_all()
 
-    def connect(self, serial=None):
+    def connect(self, serial=None, transport=None):
         """
         Connect to the first BlinkStick found
 
         @type serial: str
         @param serial: Select the serial number of BlinkStick
+        @type transport: Transport
+        @param transport: Connect through this transport instead of searching for USB devices
         """
 
-        if serial is None:
+        if transport is not None:
+            self.bstick = BlinkStick(transport=transport)
+        elif serial is None:
             self.bstick = get_first()
         else:
             self.bstick = get_by_serial(serial=serial)
 
+        if self.bstick is not None:
+            self.bstick.set_skip_redundant_writes(self.skip_redundant_writes)
+            self.bstick.set_color_correction(self.color_correction)
+
         return self.bstick is not None
 
-    def send_data(self, channel):
+    def set_skip_redundant_writes(self, value):
+        """
+        Skip sending channel data which is identical to the last data sent to the channel.
+        Use the force parameter of L{send_data} and L{send_data_all} to send it regardless.
+
+        @type value: bool
+        @param value: True/False to enable or disable skipping of redundant writes
+        """
+        self.skip_redundant_writes = value
+
+        if self.bstick is not None:
+            self.bstick.set_skip_redundant_writes(value)
+
+    def set_color_correction(self, correction):
+        """
+        Correct colors as they are sent to the device, see L{BlinkStick.set_color_correction}.
+        The frame buffer keeps the uncorrected colors.
+
+        @type correction: ColorCorrection
+        @param correction: correction to apply, None to send colors unchanged
+        """
+        self.color_correction = correction
+
+        if self.bstick is not None:
+            self.bstick.set_color_correction(correction)
+
+    def start_output_thread(self, maxsize=64):
+        """
+        Send data from a background thread, see L{BlinkStick.start_output_thread}. L{send_data}
+        and L{send_data_all} return immediately and the transmission delay is applied by the
+        background thread. Frames queued for the same channel are collapsed so only the newest
+        one is sent.
+
+        @type maxsize: int
+        @param maxsize: number of frames which can be queued before callers are blocked
+        """
+        self.bstick.start_output_thread(maxsize=maxsize, delay=self.data_transmission_delay)
+
+    def stop_output_thread(self):
+        """
+        Send all queued frames and stop the background thread.
+        """
+        self.bstick.stop_output_thread()
+
+    def get_write_counters(self):
+        """
+        Get the number of channel data frames sent to the device, skipped as redundant and dropped
+        while the circuit breaker was open.
+
+        @rtype: dict
+        @return: dictionary with "sent", "skipped" and "dropped" counts
+        """
+        return self.bstick.get_write_counters()
+
+    def send_data(self, channel, force=False):
         """
         Send data stored in the internal buffer to the channel.
 
@@ -140,24 +280,126 @@ class BlinkStickPro(object):
             - 0 - R pin on BlinkStick Pro board
             - 1 - G pin on BlinkStick Pro board
             - 2 - B pin on BlinkStick Pro board
+        @type force: bool
+        @param force: send the data even if it is the same as the last data sent,
+            see L{set_skip_redundant_writes}
         """
-        packet_data = [item for sublist in self.data[channel] for item in sublist]
+        packet_data = self._channel_data(channel)
 
         try:
-            self.bstick.set_led_data(channel, packet_data)
-            time.sleep(self.data_transmission_delay)
+            delay = self._send_paced(self.bstick.set_led_data, channel, packet_data, force)
+
+            if delay:
+                time.sleep(delay)
         except Exception as e:
             print("Exception: {0}".format(e))
 
-    def send_data_all(self):
+    def _channel_data(self, channel):
+        """
+        Get the LED data frame of a channel from the frame buffer.
+
+        @rtype: bytearray
+        @return: LED data in GRB format
+        """
+        return self.data[channel]
+
+    def _get_delay(self, start):
+        """
+        Get the time to wait after a channel has been sent.
+
+        @type start: float
+        @param start: time.perf_counter() value when the transmission started
+        @rtype: float
+        @return: time in seconds
+        """
+        if self.pacer is not None:
+            return self.pacer.get_delay(start)
+
+        return self.data_transmission_delay
+
+    def send_data_all(self, force=False):
         """
         Send data to all channels
+
+        @type force: bool
+        @param force: send the data even if it is the same as the last data sent,
+            see L{set_skip_redundant_writes}
         """
+        if self.pipelined:
+            self._send_pipelined(force)
+            return
+
         if self.r_led_count > 0:
-            self.send_data(0)
+            self.send_data(0, force)
 
         if self.g_led_count > 0:
-            self.send_data(1)
+            self.send_data(1, force)
 
         if self.b_led_count > 0:
-            self.send_data(2)
+            self.send_data(2, force)
+
+    def _send_pipelined(self, force):
+        try:
+            delay = self._send_paced(self._send_frames, self._encode_frames(), force)
+
+            if delay:
+                time.sleep(delay)
+        except Exception as e:
+            print("Exception: {0}".format(e))
+
+    def _send_paced(self, send, *args):
+        """
+        Send LED data and get the time to wait before sending more, see L{_get_delay}. Shared by
+        the blocking and the asyncio classes, which only differ in how they wait.
+
+        @param send: function sending the data, returning True if anything was sent
+        @rtype: float
+        @return: time in seconds, zero if nothing was sent or the output thread paces the reports
+        """
+        start = time.perf_counter()
+
+        if send(*args) and self.bstick.output_worker is None:
+            return self._get_delay(start)
+
+        return 0.0
+
+    def _encode_frames(self):
+        """
+        Encode the data of all channels into their own report buffers.
+
+        @rtype: list
+        @return: list of (channel, report id, number of LEDs, report) tuples
+        """
+        return [(channel,) + self.bstick._encode_led_data(channel, self._channel_data(channel), self._reports[channel])
+                for channel in self._channels()]
+
+    def _send_frames(self, frames, force):
+        """
+        Send reports encoded with L{_encode_frames} back to back and record their timing.
+
+        @rtype: bool
+        @return: True if any of the reports was sent
+        """
+        timing = {}
+        any_sent = False
+        start = time.perf_counter()
+
+        for channel, report_id, max_leds, report in frames:
+            channel_start = time.perf_counter()
+            sent = self.bstick._send_led_data(channel, report_id, max_leds, report, force)
+
+            timing[channel] = {
+                "offset": channel_start - start,
+                "duration": time.perf_counter() - channel_start,
+                "sent": sent,
+            }
+            any_sent = any_sent or sent
+
+        offsets = [channel_timing["offset"] for channel_timing in timing.values()]
+        self.frame_timing = {
+            "channels": timing,
+            "skew": max(offsets) - min(offsets) if offsets else 0.0,
+            "duration": time.perf_counter() - start,
+        }
+
+        return any_sent
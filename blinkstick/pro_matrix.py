@@ -1,5 +1,10 @@
 from blinkstick.pro import BlinkStickPro
-from blinkstick.blinkstick import blinkstick_remap_color
+from blinkstick.exception import BlinkStickException
+from blinkstick.blinkstick import blinkstick_remap_color, blinkstick_remap_table
+from blinkstick.layout import PanelLayout, compile_layout
+from blinkstick.font import FONT_3X5, FONT_5X7
+
+import operator
 
 
 class BlinkStickProMatrix(BlinkStickPro):
@@ -33,7 +38,8 @@ class BlinkStickProMatrix(BlinkStickPro):
 
     """
 
-    def __init__(self, r_columns=0, r_rows=0, g_columns=0, g_rows=0, b_columns=0, b_rows=0, delay=0.002, max_rgb=255):
+    def __init__(self, r_columns=0, r_rows=0, g_columns=0, g_rows=0, b_columns=0, b_rows=0, delay=0.002, max_rgb=255,
+                 fps=None, layouts=None):
         """
         Initialize BlinkStickProMatrix class.
 
@@ -47,6 +53,11 @@ class BlinkStickProMatrix(BlinkStickPro):
         @param delay: default transmission delay between frames
         @type max_rgb: int
         @param max_rgb: maximum color value for RGB channels
+        @type fps: float
+        @param fps: target frame rate, replaces the transmission delay when set
+        @type layouts: dict
+        @param layouts: L{PanelLayout} or list of chained panel layouts keyed by channel, see
+            L{set_layout}. Channels without a layout are wired row after row from the top left.
         """
         r_leds = r_columns * r_rows
         g_leds = g_columns * g_rows
@@ -64,17 +75,60 @@ class BlinkStickProMatrix(BlinkStickPro):
             g_led_count=g_leds,
             b_led_count=b_leds,
             delay=delay,
-            max_rgb_value=max_rgb
+            max_rgb_value=max_rgb,
+            fps=fps
         )
 
         self.rows = max(r_rows, g_rows, b_rows)
         self.cols = r_columns + g_columns + b_columns
 
         # initialise data store for matrix pre-populated with zeroes
-        self.matrix_data = []
+        # in GRB format, row after row
+        self.matrix_data = bytearray(self.rows * self.cols * 3)
+
+        self._gathers = [None, None, None]
+        layouts = layouts or {}
+        for channel in range(0, 3):
+            self.set_layout(channel, layouts.get(channel))
+
+    def set_layout(self, channel, layout):
+        """
+        Set how the LEDs of a channel are wired. The layout is compiled into a map from the LED
+        data of the channel to the matrix, so every frame is copied to the channel in one step.
+
+            >>> matrix.set_layout(0, PanelLayout(serpentine=True))
+            >>> matrix.set_layout(1, [PanelLayout(columns=8, rows=8, rotation=90),
+            ...                       PanelLayout(columns=8, rows=8, rotation=270)])
+
+        @type channel: int
+        @param channel: the channel of the panels
+        @type layout: PanelLayout or list
+        @param layout: layout of the panel or list of layouts of chained panels in the order
+            they are wired, None for a single panel wired row after row from the top left
+        @raise BlinkStickException: if the panels do not fit in the matrix or do not match the
+            number of LEDs of the channel
+        """
+        columns = (self.r_columns, self.g_columns, self.b_columns)[channel]
+        rows = (self.r_rows, self.g_rows, self.b_rows)[channel]
+
+        if columns * rows == 0:
+            self._gathers[channel] = None
+            return
+
+        if layout is None:
+            layout = PanelLayout()
 
-        for i in range(0, self.rows * self.cols):
-            self.matrix_data.append([0, 0, 0])
+        if isinstance(layout, PanelLayout):
+            layout = [layout]
+
+        indices = compile_layout(layout, sum((self.r_columns, self.g_columns, self.b_columns)[0:channel]), columns,
+                                 rows, self.cols, self.rows)
+
+        if len(indices) != len(self.data[channel]):
+            raise BlinkStickException("Layout of channel {0} has {1} LEDs instead of {2}".format(
+                channel, len(indices) // 3, len(self.data[channel]) // 3))
+
+        self._gathers[channel] = operator.itemgetter(*indices)
 
     def set_color(self, x, y, r, g, b, remap_values=True):
         """
@@ -95,9 +149,15 @@ class BlinkStickProMatrix(BlinkStickPro):
         """
 
         if remap_values:
-            r, g, b = [blinkstick_remap_color(val, self.max_rgb_value) for val in [r, g, b]]
+            r = blinkstick_remap_color(r, self.max_rgb_value)
+            g = blinkstick_remap_color(g, self.max_rgb_value)
+            b = blinkstick_remap_color(b, self.max_rgb_value)
 
-        self.matrix_data[self._coord_to_index(x, y)] = [g, r, b]
+        offset = self._coord_to_index(x, y) * 3
+        data = self.matrix_data
+        data[offset] = g
+        data[offset + 1] = r
+        data[offset + 2] = b
 
     def _coord_to_index(self, x, y):
         return y * self.cols + x
@@ -115,116 +175,197 @@ class BlinkStickProMatrix(BlinkStickPro):
         @return: 3-tuple for R, G and B values
         """
 
-        val = self.matrix_data[self._coord_to_index(x, y)]
-        return [val[1], val[0], val[2]]
+        offset = self._coord_to_index(x, y) * 3
+        data = self.matrix_data
+        return [data[offset + 1], data[offset], data[offset + 2]]
 
-    def shift_left(self, remove=False):
+    def blit(self, image, x=0, y=0, width=None, key=None, remap_values=True):
         """
-        Shift all LED values in the matrix to the left
+        Copy an image into the internal framebuffer. The image is clipped to the matrix, and
+        converted to GRB and remapped to L{max_rgb_value} in one pass over the whole image.
 
-        @type remove: bool
-        @param remove: whether to remove the pixels on the last column or move the to the first column
+            >>> matrix.blit(bytes([255, 0, 0] * 4), x=2, y=1, width=2)
+
+        @type image: bytes, bytearray, memoryview, array('B') or numpy.ndarray
+        @param image: height x width x 3 bytes of RGB data, row after row. NumPy arrays must be
+            C-contiguous and of uint8 values.
+        @type x: int
+        @param x: the x location in the matrix of the left side of the image
+        @type y: int
+        @param y: the y location in the matrix of the top of the image
+        @type width: int
+        @param width: width of the image in pixels, by default taken from the shape of a NumPy
+            array or the width of the matrix
+        @type key: (int, int, int)
+        @param key: R, G and B values of the transparent color, pixels of this color are not copied
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
         """
+        if width is None:
+            shape = getattr(image, 'shape', None)
+            width = shape[1] if shape is not None and len(shape) == 3 else self.cols
+
+        if width <= 0:
+            return
+
+        frame = self._to_grb(image, remap_values)
+        height = len(frame) // (width * 3)
 
-        temp = []
-        if not remove:
-            for y in range(0, self.rows):
-                temp.append(self.get_color(0, y))
+        left = max(x, 0)
+        right = min(x + width, self.cols)
+        top = max(y, 0)
+        bottom = min(y + height, self.rows)
 
-        for y in range(0, self.rows):
-            for x in range(0, self.cols - 1):
-                r, g, b = self.get_color(x + 1, y)
+        if left >= right or top >= bottom:
+            return
 
-                self.set_color(x, y, r, g, b, False)
+        data = self.matrix_data
+        length = (right - left) * 3
 
-        if remove:
-            for y in range(0, self.rows):
-                self.set_color(self.cols - 1, y, 0, 0, 0, False)
+        if key is not None:
+            # the key is compared with the source pixels converted the same way
+            key = bytes(self._to_grb(bytes(bytearray(key)), remap_values))
+
+        for row in range(top, bottom):
+            source = ((row - y) * width + left - x) * 3
+            target = (row * self.cols + left) * 3
+
+            if key is None:
+                data[target:target + length] = frame[source:source + length]
+                continue
+
+            for offset in range(0, length, 3):
+                pixel = frame[source + offset:source + offset + 3]
+                if pixel != key:
+                    data[target + offset:target + offset + 3] = pixel
+
+    def load_frame(self, buffer, remap_values=True):
+        """
+        Replace the internal framebuffer with a whole frame.
+
+        @type buffer: bytes, bytearray, memoryview, array('B') or numpy.ndarray
+        @param buffer: rows x columns x 3 bytes of RGB data for the whole matrix, row after row
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        if memoryview(buffer).nbytes == len(self.matrix_data):
+            self.matrix_data[:] = self._to_grb(buffer, remap_values)
         else:
-            for y in range(0, self.rows):
-                col = temp[y]
-                self.set_color(self.cols - 1, y, col[0], col[1], col[2], False)
+            self.blit(buffer, width=self.cols, remap_values=remap_values)
 
-    def shift_right(self, remove=False):
+    def _to_grb(self, image, remap_values):
         """
-        Shift all LED values in the matrix to the right
+        Convert RGB data to GRB and remap it to L{max_rgb_value}.
 
-        @type remove: bool
-        @param remove: whether to remove the pixels on the last column or move the to the first column
+        @rtype: bytearray
+        @return: GRB data
         """
+        rgb = memoryview(image)
+        if not rgb.contiguous:
+            # for example a crop of a NumPy image, which can not be cast
+            rgb = memoryview(rgb.tobytes())
 
-        temp = []
-        if not remove:
-            for y in range(0, self.rows):
-                temp.append(self.get_color(self.cols - 1, y))
+        rgb = rgb.cast('B')
+        length = len(rgb) - len(rgb) % 3
 
-        for y in range(0, self.rows):
-            for x in reversed(range(1, self.cols)):
-                r, g, b = self.get_color(x - 1, y)
+        if remap_values and self.max_rgb_value != 255:
+            rgb = memoryview(bytes(rgb[0:length]).translate(blinkstick_remap_table(self.max_rgb_value)))
 
-                self.set_color(x, y, r, g, b, False)
+        grb = bytearray(length)
+        grb[0::3] = rgb[1:length:3]
+        grb[1::3] = rgb[0:length:3]
+        grb[2::3] = rgb[2:length:3]
 
-        if remove:
-            for y in range(0, self.rows):
-                self.set_color(0, y, 0, 0, 0, False)
-        else:
-            for y in range(0, self.rows):
-                col = temp[y]
-                self.set_color(0, y, col[0], col[1], col[2], False)
+        return grb
 
-    def shift_down(self, remove=False):
+    def scroll(self, dx, dy, wrap=False):
         """
-        Shift all LED values in the matrix down
+        Move all LED values in the matrix. Each row is moved with a single slice assignment and
+        rows are moved all at once, so scrolling takes time proportional to the number of rows.
+
+        @type dx: int
+        @param dx: number of columns to move the pixels to the right, negative to move them left
+        @type dy: int
+        @param dy: number of rows to move the pixels down, negative to move them up
+        @type wrap: bool
+        @param wrap: move the pixels which leave one side of the matrix to the other side instead
+            of removing them
+        """
+        if self.rows == 0 or self.cols == 0:
+            return
+
+        data = self.matrix_data
+        row_size = self.cols * 3
+
+        if dx:
+            if wrap:
+                dx %= self.cols
+
+            shift = min(abs(dx), self.cols) * 3
+            blank = bytes(shift)
+
+            for start in range(0, len(data), row_size):
+                row = data[start:start + row_size]
+
+                if wrap:
+                    data[start:start + row_size] = row[row_size - shift:] + row[:row_size - shift]
+                elif dx > 0:
+                    data[start:start + row_size] = blank + row[:row_size - shift]
+                else:
+                    data[start:start + row_size] = row[shift:] + blank
+
+        if dy:
+            if wrap:
+                dy %= self.rows
+
+            shift = min(abs(dy), self.rows) * row_size
+
+            if wrap:
+                data[:] = data[len(data) - shift:] + data[:len(data) - shift]
+            elif dy > 0:
+                data[:] = bytes(shift) + data[:len(data) - shift]
+            else:
+                data[:] = data[shift:] + bytes(shift)
+
+    def shift_left(self, remove=False):
+        """
+        Shift all LED values in the matrix to the left
 
         @type remove: bool
         @param remove: whether to remove the pixels on the last column or move the to the first column
         """
 
-        temp = []
-        if not remove:
-            for x in range(0, self.cols):
-                temp.append(self.get_color(x, self.rows - 1))
+        self.scroll(-1, 0, wrap=not remove)
 
-        for y in reversed(range(1, self.rows)):
-            for x in range(0, self.cols):
-                r, g, b = self.get_color(x, y - 1)
+    def shift_right(self, remove=False):
+        """
+        Shift all LED values in the matrix to the right
 
-                self.set_color(x, y, r, g, b, False)
+        @type remove: bool
+        @param remove: whether to remove the pixels on the last column or move the to the first column
+        """
 
-        if remove:
-            for x in range(0, self.cols):
-                self.set_color(x, 0, 0, 0, 0, False)
-        else:
-            for x in range(0, self.cols):
-                col = temp[x]
-                self.set_color(x, 0, col[0], col[1], col[2], False)
+        self.scroll(1, 0, wrap=not remove)
 
-    def shift_up(self, remove=False):
+    def shift_down(self, remove=False):
         """
-        Shift all LED values in the matrix up
+        Shift all LED values in the matrix down
 
         @type remove: bool
         @param remove: whether to remove the pixels on the last column or move the to the first column
         """
 
-        temp = []
-        if not remove:
-            for x in range(0, self.cols):
-                temp.append(self.get_color(x, 0))
+        self.scroll(0, 1, wrap=not remove)
 
-        for x in range(0, self.cols):
-            for y in range(0, self.rows - 1):
-                r, g, b = self.get_color(x, y + 1)
+    def shift_up(self, remove=False):
+        """
+        Shift all LED values in the matrix up
 
-                self.set_color(x, y, r, g, b, False)
+        @type remove: bool
+        @param remove: whether to remove the pixels on the last column or move the to the first column
+        """
 
-        if remove:
-            for x in range(0, self.cols):
-                self.set_color(x, self.rows - 1, 0, 0, 0, False)
-        else:
-            for x in range(0, self.cols):
-                col = temp[x]
-                self.set_color(x, self.rows - 1, col[0], col[1], col[2], False)
+        self.scroll(0, -1, wrap=not remove)
 
     def number(self, x, y, n, r, g, b):
         """
@@ -243,60 +384,123 @@ class BlinkStickProMatrix(BlinkStickPro):
         @type b: int
         @param b: blue color byte
         """
-        if n == 0:
-            self.rectangle(x, y, x + 2, y + 4, r, g, b)
-        elif n == 1:
-            self.line(x + 1, y, x + 1, y + 4, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x, y + 1, r, g, b)
-        elif n == 2:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x + 2, y + 1, r, g, b)
-            self.set_color(x, y + 3, r, g, b)
-        elif n == 3:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x + 2, y + 1, r, g, b)
-            self.set_color(x + 2, y + 3, r, g, b)
-        elif n == 4:
-            self.line(x, y, x, y + 2, r, g, b)
-            self.line(x + 2, y, x + 2, y + 4, r, g, b)
-            self.set_color(x + 1, y + 2, r, g, b)
-        elif n == 5:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x, y + 1, r, g, b)
-            self.set_color(x + 2, y + 3, r, g, b)
-        elif n == 6:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x, y + 1, r, g, b)
-            self.set_color(x + 2, y + 3, r, g, b)
-            self.set_color(x, y + 3, r, g, b)
-        elif n == 7:
-            self.line(x + 1, y + 2, x + 1, y + 4, r, g, b)
-            self.line(x, y, x + 2, y, r, g, b)
-            self.set_color(x + 2, y + 1, r, g, b)
-        elif n == 8:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x, y + 1, r, g, b)
-            self.set_color(x + 2, y + 1, r, g, b)
-            self.set_color(x + 2, y + 3, r, g, b)
-            self.set_color(x, y + 3, r, g, b)
-        elif n == 9:
-            self.line(x, y, x + 2, y, r, g, b)
-            self.line(x, y + 2, x + 2, y + 2, r, g, b)
-            self.line(x, y + 4, x + 2, y + 4, r, g, b)
-            self.set_color(x, y + 1, r, g, b)
-            self.set_color(x + 2, y + 1, r, g, b)
-            self.set_color(x + 2, y + 3, r, g, b)
+        if 0 <= n <= 9:
+            self.draw_text(x, y, str(n), r, g, b, font=FONT_3X5)
+
+    def draw_text(self, x, y, text, r, g, b, font=FONT_3X5, spacing=1, remap_values=True):
+        """
+        Draw text into the internal framebuffer. Only the lit pixels of the glyphs are drawn and
+        the text is clipped to the matrix.
+
+            >>> matrix.draw_text(0, 1, "HI!", 255, 0, 0)
+
+        @type x: int
+        @param x: the x location in the matrix (left of the text)
+        @type y: int
+        @param y: the y location in the matrix (top of the text)
+        @type text: str
+        @param text: the text to draw
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type font: BitmapFont
+        @param font: font of the text, see L{blinkstick.font}
+        @type spacing: int
+        @param spacing: number of blank columns between characters
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        @rtype: int
+        @return: width of the text in pixels
+        """
+        color = self._grb(r, g, b, remap_values)
+        data = self.matrix_data
+        char_x = x
+
+        for char in text:
+            if char_x >= self.cols:
+                break
+
+            if char_x + font.width > 0:
+                for pixel_x, pixel_y in font.pixels(char):
+                    px = char_x + pixel_x
+                    py = y + pixel_y
+
+                    if 0 <= px < self.cols and 0 <= py < self.rows:
+                        offset = (py * self.cols + px) * 3
+                        data[offset:offset + 3] = color
+
+            char_x += font.width + spacing
+
+        return font.text_width(text, spacing)
+
+    def scroll_text(self, text, r, g, b, y=0, font=FONT_5X7, spacing=1, remap_values=True):
+        """
+        Scroll text through the matrix from right to left. Each step moves the rows covered by
+        the text one column to the left and draws the next column of the text on the right
+        side, so a step takes time proportional to the height of the font. Yields after each
+        step so the frame can be sent, until the text has left the matrix:
+
+            >>> for step in matrix.scroll_text("Hello world", 0, 0, 255):
+            ...     matrix.send_data_all()
+
+        @type text: str
+        @param text: the text to scroll
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type y: int
+        @param y: the y location in the matrix (top of the text)
+        @type font: BitmapFont
+        @param font: font of the text, see L{blinkstick.font}
+        @type spacing: int
+        @param spacing: number of blank columns between characters
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        @rtype: generator
+        @return: number of the step starting at 0
+        """
+        if self.cols == 0:
+            return
+
+        color = self._grb(r, g, b, remap_values)
+        blank = bytes(3)
+
+        columns = []
+        for i, char in enumerate(text):
+            if i:
+                columns.extend([0] * spacing)
+            columns.extend(font.columns(char))
+
+        # keep scrolling until the end of the text has left the matrix
+        columns.extend([0] * self.cols)
+
+        rows = [row for row in range(0, font.height) if 0 <= y + row < self.rows]
+        row_size = self.cols * 3
+        data = self.matrix_data
+
+        for step, column in enumerate(columns):
+            for row in rows:
+                start = (y + row) * row_size
+                end = start + row_size
+
+                data[start:end - 3] = data[start + 3:end]
+                data[end - 3:end] = color if column >> row & 1 else blank
+
+            yield step
+
+    def _grb(self, r, g, b, remap_values=True):
+        if remap_values:
+            r = blinkstick_remap_color(r, self.max_rgb_value)
+            g = blinkstick_remap_color(g, self.max_rgb_value)
+            b = blinkstick_remap_color(b, self.max_rgb_value)
+
+        return bytes([g, r, b])
 
     def rectangle(self, x1, y1, x2, y2, r, g, b):
         """
@@ -318,12 +522,182 @@ class BlinkStickProMatrix(BlinkStickPro):
         @param b: blue color byte
         """
 
-        self.line(x1, y1, x1, y2, r, g, b)
-        self.line(x1, y1, x2, y1, r, g, b)
-        self.line(x2, y1, x2, y2, r, g, b)
-        self.line(x1, y2, x2, y2, r, g, b)
+        color = self._grb(r, g, b)
+
+        self._hline(x1, x2, y1, color)
+        self._hline(x1, x2, y2, color)
+        self._vline(x1, y1, y2, color)
+        self._vline(x2, y1, y2, color)
+
+    def fill(self, r, g, b, remap_values=True):
+        """
+        Set all pixels in the internal framebuffer to one color.
+
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        self.matrix_data[:] = self._grb(r, g, b, remap_values) * (self.rows * self.cols)
+
+    def hline(self, x1, x2, y, r, g, b, remap_values=True):
+        """
+        Draw a horizontal line from x1:y to x2:y
+
+        @type x1: int
+        @param x1: the x location in the matrix of one end of the line
+        @type x2: int
+        @param x2: the x location in the matrix of the other end of the line
+        @type y: int
+        @param y: the y location in the matrix of the line
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        self._hline(x1, x2, y, self._grb(r, g, b, remap_values))
+
+    def vline(self, x, y1, y2, r, g, b, remap_values=True):
+        """
+        Draw a vertical line from x:y1 to x:y2
+
+        @type x: int
+        @param x: the x location in the matrix of the line
+        @type y1: int
+        @param y1: the y location in the matrix of one end of the line
+        @type y2: int
+        @param y2: the y location in the matrix of the other end of the line
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        self._vline(x, y1, y2, self._grb(r, g, b, remap_values))
+
+    def fill_rect(self, x1, y1, x2, y2, r, g, b, remap_values=True):
+        """
+        Draw a filled rectangle with it's corners at x1:y1 and x2:y2
+
+        @type x1: int
+        @param x1: the x1 location in the matrix for first corner of the rectangle
+        @type y1: int
+        @param y1: the y1 location in the matrix for first corner of the rectangle
+        @type x2: int
+        @param x2: the x2 location in the matrix for second corner of the rectangle
+        @type y2: int
+        @param y2: the y2 location in the matrix for second corner of the rectangle
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        color = self._grb(r, g, b, remap_values)
+
+        for y in range(max(min(y1, y2), 0), min(max(y1, y2), self.rows - 1) + 1):
+            self._hline(x1, x2, y, color)
+
+    def circle(self, x, y, radius, r, g, b, remap_values=True):
+        """
+        Draw a circle with its center at x:y
+
+        @type x: int
+        @param x: the x location in the matrix of the center
+        @type y: int
+        @param y: the y location in the matrix of the center
+        @type radius: int
+        @param radius: radius of the circle in pixels
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        color = self._grb(r, g, b, remap_values)
+
+        for dx, dy in _circle_octant(radius):
+            for px, py in ((dx, dy), (dy, dx), (-dy, dx), (-dx, dy), (-dx, -dy), (-dy, -dx), (dy, -dx), (dx, -dy)):
+                self._plot(x + px, y + py, color)
+
+    def fill_circle(self, x, y, radius, r, g, b, remap_values=True):
+        """
+        Draw a filled circle with its center at x:y
 
-    def line(self, x1, y1, x2, y2, r, g, b):
+        @type x: int
+        @param x: the x location in the matrix of the center
+        @type y: int
+        @param y: the y location in the matrix of the center
+        @type radius: int
+        @param radius: radius of the circle in pixels
+        @type r: int
+        @param r: red color byte
+        @type g: int
+        @param g: green color byte
+        @type b: int
+        @param b: blue color byte
+        @type remap_values: bool
+        @param remap_values: Automatically remap values based on the {max_rgb_value} supplied in the constructor
+        """
+        color = self._grb(r, g, b, remap_values)
+
+        for dx, dy in _circle_octant(radius):
+            self._hline(x - dx, x + dx, y + dy, color)
+            self._hline(x - dx, x + dx, y - dy, color)
+            self._hline(x - dy, x + dy, y + dx, color)
+            self._hline(x - dy, x + dy, y - dx, color)
+
+    def _plot(self, x, y, color):
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            offset = (y * self.cols + x) * 3
+            self.matrix_data[offset:offset + 3] = color
+
+    def _hline(self, x1, x2, y, color):
+        if not 0 <= y < self.rows:
+            return
+
+        left = max(min(x1, x2), 0)
+        right = min(max(x1, x2), self.cols - 1)
+
+        if left <= right:
+            start = (y * self.cols + left) * 3
+            self.matrix_data[start:start + (right - left + 1) * 3] = color * (right - left + 1)
+
+    def _vline(self, x, y1, y2, color):
+        if not 0 <= x < self.cols:
+            return
+
+        top = max(min(y1, y2), 0)
+        bottom = min(max(y1, y2), self.rows - 1)
+
+        if top <= bottom:
+            row_size = self.cols * 3
+            start = (top * self.cols + x) * 3
+            end = (bottom * self.cols + x) * 3 + 1
+            count = bottom - top + 1
+
+            # one extended slice per color component
+            for component in range(0, 3):
+                self.matrix_data[start + component:end + component:row_size] = color[component:component + 1] * count
+
+    def line(self, x1, y1, x2, y2, r, g, b, collect_points=True):
         """
         Draw a line from x1:y1 and x2:y2
 
@@ -341,7 +715,12 @@ class BlinkStickProMatrix(BlinkStickPro):
         @param g: green color byte
         @type b: int
         @param b: blue color byte
+        @type collect_points: bool
+        @param collect_points: return the points of the line, set to False to save building the list
+        @rtype: list
+        @return: (x, y) points of the line from x1:y1 to x2:y2, None if collect_points is False
         """
+        color = self._grb(r, g, b)
         points = []
         is_steep = abs(y2 - y1) > abs(x2 - x1)
         if is_steep:
@@ -364,18 +743,20 @@ class BlinkStickProMatrix(BlinkStickPro):
             y_step = -1
         for x in range(x1, x2 + 1):
             if is_steep:
-                # print y, "~", x
-                self.set_color(y, x, r, g, b)
-                points.append((y, x))
+                self._plot(y, x, color)
+                if collect_points:
+                    points.append((y, x))
             else:
-                # print x, " ", y
-                self.set_color(x, y, r, g, b)
-                points.append((x, y))
+                self._plot(x, y, color)
+                if collect_points:
+                    points.append((x, y))
             error -= delta_y
             if error < 0:
                 y += y_step
                 error += delta_x
                 # Reverse the list if the coordinates were reversed
+        if not collect_points:
+            return None
         if rev:
             points.reverse()
         return points
@@ -384,42 +765,38 @@ class BlinkStickProMatrix(BlinkStickPro):
         """
         Set all pixels to black in the cached matrix
         """
-        for y in range(0, self.rows):
-            for x in range(0, self.cols):
-                self.set_color(x, y, 0, 0, 0)
+        self.fill(0, 0, 0, remap_values=False)
 
-    def send_data(self, channel):
+    def _channel_data(self, channel):
         """
-        Send data stored in the internal buffer to the channel.
+        Copy the LEDs of the matrix wired to a channel into the frame buffer of the channel.
 
-        @param channel:
-            - 0 - R pin on BlinkStick Pro board
-            - 1 - G pin on BlinkStick Pro board
-            - 2 - B pin on BlinkStick Pro board
+        @rtype: bytearray
+        @return: LED data in GRB format
         """
+        gather = self._gathers[channel]
 
-        start_col = 0
-        end_col = 0
-
-        if channel == 0:
-            start_col = 0
-            end_col = self.r_columns
+        if gather is not None:
+            self.data[channel][:] = bytes(gather(self.matrix_data))
 
-        if channel == 1:
-            start_col = self.r_columns
-            end_col = start_col + self.g_columns
+        return super(BlinkStickProMatrix, self)._channel_data(channel)
 
-        if channel == 2:
-            start_col = self.r_columns + self.g_columns
-            end_col = start_col + self.b_columns
 
-        self.data[channel] = []
+def _circle_octant(radius):
+    # points of one octant of a circle, from the midpoint circle algorithm
+    x = radius
+    y = 0
+    error = 1 - radius
+    points = []
 
-        # slice the huge array to individual packets
-        for y in range(0, self.rows):
-            start = y * self.cols + start_col
-            end = y * self.cols + end_col
+    while x >= y:
+        points.append((x, y))
+        y += 1
 
-            self.data[channel].extend(self.matrix_data[start: end])
+        if error < 0:
+            error += 2 * y + 1
+        else:
+            x -= 1
+            error += 2 * (y - x) + 1
 
-        super(BlinkStickProMatrix, self).send_data(channel)
+    return points
@@ -0,0 +1,144 @@
+import threading
+import time
+
+"""
+Policies for reconnecting to BlinkStick devices after communication errors.
+"""
+
+# Returned instead of the transfer result for writes dropped while the circuit breaker is open
+DROPPED = object()
+
+
+class ReconnectPolicy(object):
+    """
+    Defines how L{BlinkStick} recovers when a transfer to the device fails.
+
+    After a failed transfer the device is searched for again by serial number and the transfer is
+    retried up to L{retries} times, waiting with exponential backoff before each attempt.
+
+    When L{failure_threshold} is set, a circuit breaker opens after that many consecutive failed
+    transfers. While it is open, transfers fail immediately (or writes are dropped when
+    L{drop_writes} is set) instead of searching for the device again, and a background thread
+    probes for the device every L{probe_interval} seconds. The breaker closes once the device is
+    found again.
+
+    The default policy retries once without waiting and never opens the circuit breaker.
+    """
+
+    def __init__(self, retries=1, backoff=0.0, backoff_factor=2.0, max_backoff=1.0, failure_threshold=None,
+                 probe_interval=1.0, drop_writes=False):
+        """
+        Constructor for the class.
+
+        @type  retries: int
+        @param retries: number of attempts to reconnect and retry a failed transfer
+        @type  backoff: float
+        @param backoff: time in seconds to wait before the first reconnect attempt
+        @type  backoff_factor: float
+        @param backoff_factor: multiplier applied to the wait before each further attempt
+        @type  max_backoff: float
+        @param max_backoff: maximum time in seconds to wait before an attempt
+        @type  failure_threshold: int
+        @param failure_threshold: consecutive failed transfers which open the circuit breaker,
+            None to disable the circuit breaker
+        @type  probe_interval: float
+        @param probe_interval: time in seconds between attempts to find the device while the
+            circuit breaker is open
+        @type  drop_writes: bool
+        @param drop_writes: silently drop writes while the circuit breaker is open instead of
+            raising L{BlinkStickException}
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.drop_writes = drop_writes
+
+    def get_backoff(self, attempt):
+        """
+        Get the time to wait before a reconnect attempt.
+
+        @type  attempt: int
+        @param attempt: number of the attempt starting at 0
+        @rtype: float
+        @return: time in seconds
+        """
+        return min(self.backoff * self.backoff_factor ** attempt, self.max_backoff)
+
+
+class CircuitBreaker(object):
+    """
+    Tracks consecutive failed transfers of a L{BlinkStick} and stops further attempts to reach
+    the device while it is gone, see L{ReconnectPolicy}.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, bstick, policy):
+        """
+        Constructor for the class.
+
+        @type  bstick: BlinkStick
+        @param bstick: device to track
+        @type  policy: ReconnectPolicy
+        @param policy: policy with the failure threshold and probe interval
+        """
+        self.bstick = bstick
+        self.policy = policy
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.trips = 0
+
+        self._lock = threading.Lock()
+        self._probe = None
+
+    def is_open(self):
+        """
+        @rtype: bool
+        @return: True if transfers to the device should not be attempted
+        """
+        return self.state == CircuitBreaker.OPEN
+
+    def record_success(self):
+        """
+        Record a successful transfer.
+        """
+        self.failures = 0
+
+    def record_failure(self):
+        """
+        Record a failed transfer and open the breaker once the failure threshold is reached.
+        """
+        with self._lock:
+            self.failures += 1
+
+            if self.state == CircuitBreaker.OPEN or self.failures < self.policy.failure_threshold:
+                return
+
+            self.state = CircuitBreaker.OPEN
+            self.trips += 1
+
+            self._probe = threading.Thread(target=self._run_probe, name="BlinkStick probe")
+            self._probe.daemon = True
+            self._probe.start()
+
+    def close(self):
+        """
+        Close the breaker and allow transfers again.
+        """
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+
+    def _run_probe(self):
+        while self.is_open():
+            time.sleep(self.policy.probe_interval)
+
+            try:
+                if self.bstick._refresh_device():
+                    self.close()
+            except Exception:
+                pass
@@ -0,0 +1,167 @@
+from blinkstick.transport import Transport
+from blinkstick.exception import BlinkStickTransportException
+
+from array import array
+import time
+
+"""
+In-process simulation of a BlinkStick device. Useful to exercise and benchmark the library
+without any hardware attached, for example:
+
+    >>> from blinkstick.blinkstick import BlinkStick
+    >>> from blinkstick.simulator import SimulatedTransport
+    >>> stick = BlinkStick(transport=SimulatedTransport(serial="BS000001-3.0"))
+    >>> stick.set_color(red=255)
+"""
+
+LED_DATA_REPORT_SIZES = {6: 8, 7: 16, 8: 32, 9: 64}
+
+
+class SimulatedDevice(object):
+    """
+    Model of the BlinkStick firmware. It keeps the LED RAM for each of the R, G and B channels
+    in GRB order, the device mode, the LED count and both info blocks, and answers the feature
+    reports 1-9 and 0x81 the same way the device does.
+    """
+
+    def __init__(self, serial="BS000000-3.0", manufacturer="Agile Innovative Ltd", description="BlinkStick",
+                 mode=0, led_count=1, latency=0.0):
+        """
+        Constructor for the class.
+
+        @type  serial: str
+        @param serial: serial number reported in string descriptor 3
+        @type  manufacturer: str
+        @param manufacturer: manufacturer reported in string descriptor 1
+        @type  description: str
+        @param description: product description reported in string descriptor 2
+        @type  mode: int
+        @param mode: initial device mode
+        @type  led_count: int
+        @param led_count: initial number of LEDs
+        @type  latency: float
+        @param latency: time in seconds each transfer takes, 0 to measure library overhead only
+        """
+        self.serial = serial
+        self.manufacturer = manufacturer
+        self.description = description
+        self.mode = mode
+        self.led_count = led_count
+        self.latency = latency
+
+        self.info_blocks = {2: bytearray(32), 3: bytearray(32)}
+        self.led_data = [bytearray(64 * 3) for i in range(0, 3)]
+        self.led_data_channel = 0
+
+        self.writes = 0
+        self.reads = 0
+
+        # set to False to simulate the device being unplugged
+        self.connected = True
+
+    def write_report(self, report_id, data):
+        """
+        Process a feature report sent by the host.
+        """
+        self.writes += 1
+
+        if report_id == 1:
+            r, g, b = data[1:4]
+            self.led_data[0][0:3] = bytearray([g, r, b])
+        elif report_id in self.info_blocks:
+            block = bytearray(data[1:33])
+            self.info_blocks[report_id][:] = block + bytearray(32 - len(block))
+        elif report_id == 4:
+            self.mode = data[1]
+        elif report_id == 5:
+            channel, index, r, g, b = data[1:6]
+            self.led_data[channel][index * 3:index * 3 + 3] = bytearray([g, r, b])
+        elif report_id in LED_DATA_REPORT_SIZES:
+            size = LED_DATA_REPORT_SIZES[report_id] * 3
+            self.led_data_channel = data[1]
+            self.led_data[data[1]][0:size] = bytearray(data[2:2 + size])
+        elif report_id == 0x81:
+            self.led_count = data[1]
+        else:
+            raise BlinkStickTransportException("Unsupported report {0}".format(report_id))
+
+    def read_report(self, report_id, length):
+        """
+        Build the feature report requested by the host.
+        """
+        self.reads += 1
+
+        if report_id == 1:
+            g, r, b = self.led_data[0][0:3]
+            report = bytearray([1, r, g, b]) + bytearray(29)
+        elif report_id in self.info_blocks:
+            report = bytearray([report_id]) + self.info_blocks[report_id]
+        elif report_id == 4:
+            report = bytearray([4, self.mode])
+        elif report_id in LED_DATA_REPORT_SIZES:
+            size = LED_DATA_REPORT_SIZES[report_id] * 3
+            channel = self.led_data_channel
+            report = bytearray([report_id, channel]) + self.led_data[channel][0:size]
+        elif report_id == 0x81:
+            report = bytearray([0x81, self.led_count])
+        else:
+            raise BlinkStickTransportException("Unsupported report {0}".format(report_id))
+
+        return array('B', report[0:length])
+
+    def get_string(self, index):
+        """
+        Return the string descriptor with the supplied index.
+        """
+        if index == 1:
+            return self.manufacturer
+        elif index == 2:
+            return self.description
+        elif index == 3:
+            return self.serial
+
+        raise BlinkStickTransportException("Unsupported string descriptor {0}".format(index))
+
+
+class SimulatedTransport(Transport):
+    """
+    Transport connected to a L{SimulatedDevice} instead of USB hardware.
+    """
+
+    def __init__(self, device=None, **kwargs):
+        """
+        Constructor for the class.
+
+        @type  device: SimulatedDevice
+        @param device: simulated device, a new one is created from kwargs if not supplied
+        """
+        self.device = device if device is not None else SimulatedDevice(**kwargs)
+
+    @property
+    def location(self):
+        return None
+
+    def _wire(self):
+        if not self.device.connected:
+            raise BlinkStickTransportException("Simulated BlinkStick {0} is unplugged".format(self.device.serial))
+
+        if self.device.latency:
+            time.sleep(self.device.latency)
+
+    def write_report(self, report_id, data):
+        self._wire()
+        self.device.write_report(report_id, data)
+
+        return len(data)
+
+    def read_report(self, report_id, length):
+        self._wire()
+        return self.device.read_report(report_id, length)
+
+    def read_string(self, index):
+        self._wire()
+        return self.device.get_string(index)
+
+    def reconnect(self, serial):
+        if self.device.connected and self.device.serial == serial:
+            return self
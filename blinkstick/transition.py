@@ -0,0 +1,100 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+"""
+Batched color transitions for many LEDs at once.
+"""
+
+
+def transition_frames(start, end, steps, use_numpy=None):
+    """
+    Generate the frames of a linear transition between two LED frames.
+
+    Frames are generated lazily, one at a time, so memory use does not depend on the number of
+    steps. Each frame is a new contiguous buffer with 3 bytes per LED in the same component
+    order as the input frames, so GRB frames can be passed to L{BlinkStick.set_led_data}
+    directly. NumPy is used when it is installed, otherwise the frames are computed in pure
+    Python. Both produce the same values.
+
+        >>> for frame in transition_frames(bstick.get_led_data(8 * 3), [0, 255, 0] * 8, 50):
+        ...     bstick.set_led_data(0, frame)
+
+    @type  start: list, bytes, bytearray, array('B') or numpy.ndarray
+    @param start: frame at the start of the transition, either a flat sequence of 0..255 values
+        or a sequence of N [c1, c2, c3] lists, or a NumPy array of any shape such as N x 3
+    @type  end: list, bytes, bytearray, array('B') or numpy.ndarray
+    @param end: frame at the end of the transition in the same format as start
+    @type  steps: int
+    @param steps: number of frames to generate, the last frame is equal to end
+    @type  use_numpy: bool
+    @param use_numpy: force or disable the use of NumPy, by default it is used when installed
+    @rtype: generator
+    @return: bytearray frames in pure Python, numpy.ndarray frames of uint8 values with NumPy
+    """
+    start = _flatten(start)
+    end = _flatten(end)
+
+    if len(start) != len(end):
+        raise ValueError("start and end frames must have the same length")
+
+    steps = max(int(steps), 1)
+
+    if use_numpy is None:
+        use_numpy = numpy is not None
+
+    if use_numpy:
+        return _numpy_frames(start, end, steps)
+
+    return _python_frames(start, end, steps)
+
+
+def _is_ndarray(frame):
+    return numpy is not None and isinstance(frame, numpy.ndarray)
+
+
+def _flatten(frame):
+    if _is_ndarray(frame):
+        return frame.reshape(-1)
+
+    if len(frame) and isinstance(frame[0], (list, tuple)):
+        return [value for led in frame for value in led]
+
+    return frame
+
+
+def _python_frames(start, end, steps):
+    # NumPy values would overflow in the arithmetic below, use Python integers
+    if _is_ndarray(start):
+        start = start.tolist()
+    if _is_ndarray(end):
+        end = end.tolist()
+
+    half = steps // 2
+    pairs = list(zip(start, end))
+
+    for n in range(1, steps + 1):
+        remaining = steps - n
+        yield bytearray([(s * remaining + e * n + half) // steps for s, e in pairs])
+
+
+def _to_numpy(frame):
+    if isinstance(frame, (list, tuple, numpy.ndarray)):
+        return numpy.asarray(frame, dtype=numpy.int32).reshape(-1)
+
+    # bytes like objects are read as raw bytes, asarray would parse them as numbers
+    return numpy.frombuffer(memoryview(frame).cast('B'), dtype=numpy.uint8).astype(numpy.int32)
+
+
+def _numpy_frames(start, end, steps):
+    start = _to_numpy(start)
+    end = _to_numpy(end)
+    delta = end - start
+    half = steps // 2
+
+    for n in range(1, steps + 1):
+        # start + delta * n / steps, rounded half up in integer arithmetic
+        frame = start * steps + delta * n + half
+        frame //= steps
+        yield frame.astype(numpy.uint8)
@@ -0,0 +1,362 @@
+from blinkstick.exception import BlinkStickException, BlinkStickTransportException
+
+import sys
+import threading
+
+if sys.platform == "win32":
+    import pywinusb.hid as hid
+    from ctypes import c_ubyte
+else:
+    import usb.core
+    import usb.util
+
+"""
+Transports carry HID feature reports between L{BlinkStick} objects and the device.
+
+Every transport implements the same three operations:
+
+    - L{Transport.write_report} - control transfer writing a feature report (SET_REPORT)
+    - L{Transport.read_report} - control transfer reading a feature report (GET_REPORT)
+    - L{Transport.read_string} - read a USB string descriptor
+
+String descriptors never change while a device is connected, so L{Transport.get_string} reads
+each of them only once per transport.
+
+The platform specific backends are L{UsbTransport} (pyusb) and L{WinUsbTransport} (pywinusb).
+"""
+
+VENDOR_ID = 0x20a0
+PRODUCT_ID = 0x41e5
+
+
+class Transport(object):
+    """
+    Base class for all transports. Subclasses must implement L{write_report},
+    L{read_report} and L{read_string} and raise L{BlinkStickTransportException}
+    when communication with the device fails.
+    """
+
+    device = None
+    _strings = None
+
+    @property
+    def location(self):
+        """
+        Location of the device on the USB bus, see L{device_location}.
+        """
+        if self.device is not None:
+            return device_location(self.device)
+
+    def open(self):
+        """
+        Prepare the device for transfers.
+
+        @rtype: bool
+        @return: True if the device is ready
+        """
+        return True
+
+    def write_report(self, report_id, data):
+        """
+        Send a feature report to the device.
+
+        @type  report_id: int
+        @param report_id: HID report id
+        @type  data: bytes
+        @param data: report payload, including the leading report id byte
+        """
+        raise NotImplementedError
+
+    def read_report(self, report_id, length):
+        """
+        Read a feature report from the device.
+
+        @type  report_id: int
+        @param report_id: HID report id
+        @type  length: int
+        @param length: number of bytes to read, including the leading report id byte
+        @rtype: int[]
+        @return: report data as returned by the device
+        """
+        raise NotImplementedError
+
+    def get_string(self, index):
+        """
+        Get a string descriptor of the device. The descriptor is only read from the device
+        the first time it is requested.
+
+        @type  index: int
+        @param index: 1 - manufacturer, 2 - product description, 3 - serial number
+        @rtype: str
+        @return: value of the string descriptor
+        """
+        if self._strings is None:
+            self._strings = {}
+
+        if index not in self._strings:
+            self._strings[index] = self.read_string(index)
+
+        return self._strings[index]
+
+    def read_string(self, index):
+        """
+        Read a string descriptor from the device.
+
+        @type  index: int
+        @param index: 1 - manufacturer, 2 - product description, 3 - serial number
+        @rtype: str
+        @return: value of the string descriptor
+        """
+        raise NotImplementedError
+
+    def reconnect(self, serial):
+        """
+        Find the device with the supplied serial number again, for example after it has been
+        unplugged and plugged back in.
+
+        @type  serial: str
+        @param serial: serial number of the device
+        @rtype: Transport
+        @return: new unopened transport for the device or None if the device could not be found
+        """
+        device = find_device_by_serial(serial)
+        if device is not None:
+            return create_transport(device)
+
+
+class UsbTransport(Transport):
+    """
+    Transport using pyusb control transfers.
+    """
+
+    def __init__(self, device):
+        self.device = device
+
+    def open(self):
+        if self.device.is_kernel_driver_active(0):
+            try:
+                self.device.detach_kernel_driver(0)
+            except usb.core.USBError as e:
+                raise BlinkStickException("Could not detach kernel driver: %s" % str(e))
+
+        return True
+
+    def write_report(self, report_id, data):
+        try:
+            return self.device.ctrl_transfer(0x20, 0x9, report_id, 0, data)
+        except usb.USBError as e:
+            raise BlinkStickTransportException(str(e))
+
+    def read_report(self, report_id, length):
+        try:
+            return self.device.ctrl_transfer(0x80 | 0x20, 0x1, report_id, 0, length)
+        except usb.USBError as e:
+            raise BlinkStickTransportException(str(e))
+
+    def read_string(self, index):
+        try:
+            return usb.util.get_string(self.device, index)
+        except usb.USBError as e:
+            raise BlinkStickTransportException(str(e))
+
+
+class WinUsbTransport(Transport):
+    """
+    Transport using pywinusb feature reports.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.reports = None
+
+    def open(self):
+        self.device.open()
+        self.reports = self.device.find_feature_reports()
+
+        return True
+
+    def write_report(self, report_id, data):
+        report = (c_ubyte * len(data))(*bytearray(data))
+        report[0] = report_id
+
+        if not self.device.send_feature_report(report):
+            raise BlinkStickTransportException("Could not send feature report {0}".format(report_id))
+
+    def read_report(self, report_id, length):
+        return self.reports[report_id - 1].get()
+
+    def read_string(self, index):
+        if index == 1:
+            return self.device.vendor_name
+        elif index == 2:
+            return self.device.product_name
+        elif index == 3:
+            return self.device.serial_number
+
+        raise BlinkStickTransportException("Unsupported string descriptor {0}".format(index))
+
+
+class DeviceRegistry(object):
+    """
+    Index of BlinkStick serial numbers to the location of the device on the USB bus. It allows to
+    reopen a device by serial number without reading the serial number of every attached device.
+
+    The index is updated whenever a serial number is read from a device and entries are dropped
+    when the device is no longer found at the recorded location.
+    """
+
+    def __init__(self):
+        self._locations = {}
+        self._lock = threading.Lock()
+
+    def register(self, serial, location):
+        """
+        Record the location of the device with the supplied serial number.
+
+        @type  serial: str
+        @param serial: serial number of the device
+        @param location: location returned by L{device_location}
+        """
+        if serial is None or location is None:
+            return
+
+        with self._lock:
+            self._locations[serial] = location
+
+    def forget(self, serial):
+        """
+        Drop the recorded location of the device with the supplied serial number.
+
+        @type  serial: str
+        @param serial: serial number of the device
+        """
+        with self._lock:
+            self._locations.pop(serial, None)
+
+    def get_location(self, serial):
+        """
+        Get the recorded location of the device with the supplied serial number.
+
+        @type  serial: str
+        @param serial: serial number of the device
+        @return: location or None if the device is not known
+        """
+        with self._lock:
+            return self._locations.get(serial)
+
+    def find(self, serial):
+        """
+        Find the device with the supplied serial number. The device at the recorded location is
+        checked first and all attached devices are only searched if it is not there anymore.
+
+        @type  serial: str
+        @param serial: serial number of the device
+        @return: device or None if no device with this serial number is attached
+        """
+        location = self.get_location(serial)
+
+        if location is not None:
+            device = find_device_by_location(location)
+
+            try:
+                if device is not None and create_transport(device).get_string(3) == serial:
+                    return device
+            except BlinkStickTransportException:
+                pass
+
+            self.forget(serial)
+
+        for d in find_devices():
+            location = device_location(d)
+
+            try:
+                device_serial = create_transport(d).get_string(3)
+            except Exception as e:
+                print("{0}".format(e))
+                continue
+
+            self.register(device_serial, location)
+
+            if device_serial == serial:
+                return d
+
+
+registry = DeviceRegistry()
+
+
+def device_location(device):
+    """
+    Get the location of a device on the USB bus. Uses the bus and port numbers, which stay the same
+    when the device is plugged back into the same port, or the device path on Windows.
+
+    @return: hashable location of the device
+    """
+    if sys.platform == "win32":
+        return device.device_path
+    else:
+        port_numbers = getattr(device, "port_numbers", None)
+
+        if port_numbers:
+            return device.bus, tuple(port_numbers)
+        else:
+            return device.bus, device.address
+
+
+def find_device_by_location(location):
+    """
+    Find the BlinkStick device at a location returned by L{device_location} without opening any device.
+
+    @return: device or None if there is no BlinkStick device at the location
+    """
+    if sys.platform == "win32":
+        for d in find_devices():
+            if device_location(d) == location:
+                return d
+    else:
+        return usb.core.find(idVendor=VENDOR_ID, idProduct=PRODUCT_ID,
+                             custom_match=lambda d: device_location(d) == location)
+
+
+def create_transport(device):
+    """
+    Create the platform transport for a device found by L{find_devices}.
+
+    @rtype: Transport
+    @return: unopened transport for the device
+    """
+    if sys.platform == "win32":
+        return WinUsbTransport(device)
+    else:
+        return UsbTransport(device)
+
+
+def find_devices(find_all=True):
+    """
+    Enumerate attached BlinkStick devices without opening them.
+
+    @type  find_all: bool
+    @param find_all: return all devices or only the first one
+    @return: list of devices when find_all is True, otherwise the first device or None
+    """
+    if sys.platform == "win32":
+        devices = hid.HidDeviceFilter(vendor_id=VENDOR_ID, product_id=PRODUCT_ID).get_devices()
+        if find_all:
+            return devices
+        elif len(devices) > 0:
+            return devices[0]
+        else:
+            return None
+
+    else:
+        return usb.core.find(find_all=find_all, idVendor=VENDOR_ID, idProduct=PRODUCT_ID)
+
+
+def find_device_by_serial(serial):
+    """
+    Find the attached BlinkStick device with the supplied serial number, see L{DeviceRegistry.find}.
+
+    @type  serial: str
+    @param serial: serial number of the device
+    @return: device or None if no device with this serial number is attached
+    """
+    return registry.find(serial)
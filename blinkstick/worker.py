@@ -0,0 +1,198 @@
+from blinkstick.reconnect import DROPPED
+
+from concurrent.futures import Future
+
+import collections
+import threading
+import time
+
+"""
+Background output thread for L{BlinkStick} devices.
+"""
+
+LED_DATA_REPORT_SIZES = {6: 8, 7: 16, 8: 32, 9: 64}
+
+
+class OutputWorker(threading.Thread):
+    """
+    Thread which owns the connection to a BlinkStick and performs all transfers on behalf of
+    the callers. Writes are queued and return immediately. Reports queued for the same target
+    are collapsed so that only the newest data is sent:
+
+        - LED data frames replace the queued frame for the same channel
+        - single LED colors are merged into the queued frame for their channel when possible
+        - any other report replaces the queued report with the same report id
+
+    Reads are queued behind the pending writes and wait for their result.
+
+    Use L{BlinkStick.start_output_thread} rather than creating the worker directly.
+    """
+
+    def __init__(self, bstick, maxsize=64, delay=0):
+        """
+        Constructor for the class.
+
+        @type  bstick: BlinkStick
+        @param bstick: device to perform the transfers for
+        @type  maxsize: int
+        @param maxsize: number of reports which can be queued before writers are blocked
+        @type  delay: float
+        @param delay: time in seconds to wait after each LED data frame is sent
+        """
+        super(OutputWorker, self).__init__(name="BlinkStick output")
+        self.daemon = True
+
+        self.bstick = bstick
+        self.maxsize = maxsize
+        self.delay = delay
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_error = None
+
+        self._pending = collections.OrderedDict()
+        self._condition = threading.Condition()
+        self._running = True
+        self._busy = False
+        self._calls = 0
+
+    def write(self, report_id, report):
+        """
+        Queue a report to be sent to the device.
+
+        @type  report_id: int
+        @param report_id: HID report id
+        @type  report: bytes
+        @param report: report data
+        """
+        report = bytes(report)
+
+        with self._condition:
+            if report_id == 5:
+                channel, index = report[1], report[2]
+                frame = self._pending.get((channel, None))
+
+                if frame is not None and index < LED_DATA_REPORT_SIZES[frame[1]]:
+                    # the frame has not been sent yet, update the LED in the frame instead
+                    g, r, b = report[4], report[3], report[5]
+                    data = bytearray(frame[2])
+                    data[2 + index * 3:2 + index * 3 + 3] = bytearray([g, r, b])
+                    self._pending[(channel, None)] = ('write', frame[1], bytes(data))
+                    self.coalesced += 1
+                    return
+
+                key = (channel, index)
+            elif report_id in LED_DATA_REPORT_SIZES:
+                channel = report[1]
+                key = (channel, None)
+                size = LED_DATA_REPORT_SIZES[report_id]
+
+                frame = self._pending.get(key)
+                if frame is not None and LED_DATA_REPORT_SIZES[frame[1]] > size:
+                    # keep the LEDs of the queued frame which are not covered by the new one
+                    report = report + frame[2][len(report):]
+                    report_id = frame[1]
+                    size = LED_DATA_REPORT_SIZES[report_id]
+
+                for pending_key in list(self._pending):
+                    if pending_key[0] == channel and pending_key[1] is not None and pending_key[1] < size:
+                        del self._pending[pending_key]
+                        self.coalesced += 1
+            else:
+                key = ('report', report_id)
+
+            if key in self._pending:
+                del self._pending[key]
+                self.coalesced += 1
+            else:
+                while len(self._pending) >= self.maxsize and self._running:
+                    self._condition.wait()
+
+            self._pending[key] = ('write', report_id, report)
+            self._condition.notify_all()
+
+    def call(self, function, *args):
+        """
+        Run a function on the worker thread after all pending writes and wait for its result.
+
+        @return: result of the function
+        """
+        future = Future()
+
+        with self._condition:
+            self._calls += 1
+            self._pending[('call', self._calls)] = ('call', function, args, future)
+            self._condition.notify_all()
+
+        return future.result()
+
+    def flush(self):
+        """
+        Wait until all queued reports have been sent.
+        """
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+
+    def stop(self):
+        """
+        Send the queued reports and stop the thread.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        self.join()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and self._running:
+                    self._condition.wait()
+
+                if not self._pending:
+                    return
+
+                key, item = self._pending.popitem(last=False)
+                self._busy = True
+                self._condition.notify_all()
+
+            try:
+                if item[0] == 'call':
+                    self._run_call(*item[1:])
+                else:
+                    self._run_write(item[1], item[2])
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _run_call(self, function, args, future):
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run_write(self, report_id, report):
+        try:
+            if self.bstick._usb_ctrl_transfer(0x20, 0x9, report_id, 0, report) is DROPPED:
+                self.dropped += 1
+                self.bstick._dropped_write()
+                return
+
+            self.sent += 1
+        except Exception as e:
+            self.errors += 1
+            self.last_error = e
+
+            if self.bstick.error_reporting:
+                print("Exception: {0}".format(e))
+            else:
+                self.bstick._swallowed_error()
+
+            return
+
+        if self.delay and report_id in LED_DATA_REPORT_SIZES:
+            time.sleep(self.delay)
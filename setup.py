@@ -43,15 +43,19 @@ setup_options = dict(
     scripts=['bin/blinkstick'],
     packages=find_packages(exclude=['tests*']),
     install_requires=install_requires,
+    extras_require={
+        "numpy": ["numpy"],
+    },
+    python_requires='>=3.7',
     license="LICENSE.txt",
     classifiers=[
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
 )
 
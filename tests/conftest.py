@@ -0,0 +1,17 @@
+from blinkstick.blinkstick import BlinkStick
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
+
+import pytest
+
+
+@pytest.fixture
+def simulated_stick():
+    """
+    Factory creating a BlinkStick connected to a simulated BlinkStick Pro in mode 2. Keyword
+    arguments are passed to L{SimulatedDevice}.
+    """
+    def create(**kwargs):
+        device = SimulatedDevice(mode=2, **kwargs)
+        return BlinkStick(transport=SimulatedTransport(device)), device
+
+    return create
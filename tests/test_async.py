@@ -1,26 +1,121 @@
 from blinkstick.blinkstick import get_first
-from blinkstick.asyncio import AsyncBlinkStick
+from blinkstick.asyncio import AsyncBlinkStick, AsyncBlinkStickPro, AsyncBlinkStickProMatrix
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
 
 import asyncio
+import time
 
 
-@asyncio.coroutine
-def do_other_stuff(delay, repeats):
+def test_transfers_do_not_block_event_loop():
+    latency = 0.2
+    device = SimulatedDevice(mode=2, latency=latency)
+    stick = AsyncBlinkStick(transport=SimulatedTransport(device))
+    ticks = []
+
+    async def tick():
+        for i in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(stick.set_color(red=255), stick.set_led_data(1, [1, 2, 3]), tick())
+        return await stick.get_color(), await stick.get_info_block1()
+
+    color, info_block = asyncio.run(run())
+
+    assert color == [255, 0, 0]
+    assert info_block == ""
+    # a transfer made on the event loop would hold up a tick for the whole latency
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < latency / 2
+    assert device.led_data[1][0:3] == bytearray([1, 2, 3])
+    stick.close()
+
+
+def test_device_is_opened_on_the_io_thread():
+    device = SimulatedDevice(serial="BS000042-3.0")
+    stick = AsyncBlinkStick(transport=SimulatedTransport(device))
+
+    assert not stick.bstick._opened
+
+    assert asyncio.run(stick.open_device())
+    assert stick.bstick._opened
+    assert stick.bs_serial == "BS000042-3.0"
+    stick.close()
+
+
+def test_morph_runs_off_the_event_loop():
+    device = SimulatedDevice()
+    stick = AsyncBlinkStick(transport=SimulatedTransport(device))
+    stick.set_max_rgb_value(255)
+
+    asyncio.run(stick.morph(blue=255, duration=50, steps=5))
+
+    assert device.led_data[0][0:3] == bytearray([0, 0, 255])
+    stick.close()
+
+
+class _TimedTransport(SimulatedTransport):
+    # records when each LED data write starts and ends
+    def __init__(self, device):
+        super(_TimedTransport, self).__init__(device)
+        self.writes = []
+
+    def write_report(self, report_id, data):
+        start = time.monotonic()
+        result = super(_TimedTransport, self).write_report(report_id, data)
+        self.writes.append((start, time.monotonic()))
+
+        return result
+
+
+def test_pro_boards_share_event_loop():
+    devices = [SimulatedDevice(mode=2, latency=0.05), SimulatedDevice(mode=2, latency=0.05)]
+    transports = [_TimedTransport(device) for device in devices]
+    pro = AsyncBlinkStickPro(r_led_count=8, g_led_count=8, delay=0.02)
+    pro.connect(transport=transports[0])
+    matrix = AsyncBlinkStickProMatrix(r_columns=4, r_rows=2, fps=50)
+    matrix.connect(transport=transports[1])
+
+    pro.set_color(1, 7, 1, 2, 3)
+    matrix.set_color(x=3, y=1, r=4, g=5, b=6)
+
+    for transport in transports:
+        del transport.writes[:]
+
+    async def run():
+        await asyncio.gather(pro.send_data_all(), matrix.send_data_all())
+
+    asyncio.run(run())
+
+    # the matrix frame is sent while the pro board is still busy with its channels
+    pro_writes, matrix_writes = transports[0].writes, transports[1].writes
+    assert matrix_writes[0][0] < pro_writes[-1][1]
+    assert pro_writes[0][0] < matrix_writes[-1][1]
+    assert devices[0].led_data[1][21:24] == bytearray([2, 1, 3])
+    assert devices[1].led_data[0][21:24] == bytearray([5, 4, 6])
+
+    asyncio.run(matrix.off())
+    assert devices[1].led_data[0][21:24] == bytearray([0, 0, 0])
+    pro.close()
+    matrix.close()
+
+
+async def do_other_stuff(delay, repeats):
     for i in range(1, repeats+1):
         print('Doing stuff {}'.format(i))
-        yield from asyncio.sleep(delay)
+        await asyncio.sleep(delay)
 
 
-@asyncio.coroutine
-def main():
+async def main():
     device = get_first(blinkstick=AsyncBlinkStick)
+    await device.open_device()
     # Both of these tasks take 5 seconds
-    yield from asyncio.wait([
+    await asyncio.gather(
         device.pulse(blue=50, repeats=3, duration=1000, channel=0, index=1),
         device.blink(green=100, repeats=5, delay=100, channel=0, index=0),
         do_other_stuff(repeats=10, delay=0.5),
-    ])
+    )
 
 
-loop = asyncio.get_event_loop()
-loop.run_until_complete(main())
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,313 @@
+from blinkstick.blinkstick import blinkstick_remap
+from blinkstick.exception import BlinkStickException
+from blinkstick.reconnect import ReconnectPolicy
+
+from array import array
+import pytest
+import time
+
+
+def test_set_colors_sends_single_frame(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_colors(channel=0, colors={0: (255, 0, 0), 3: '#00ff00', 7: 'blue'})
+
+    assert device.writes == 1
+    assert device.led_data[0][0:3] == bytearray([0, 255, 0])
+    assert device.led_data[0][9:12] == bytearray([255, 0, 0])
+    assert device.led_data[0][21:24] == bytearray([0, 0, 255])
+
+
+def test_set_colors_keeps_previous_colors(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_color(channel=0, index=1, red=1, green=2, blue=3)
+    stick.set_colors(channel=0, colors=['red'])
+    stick.set_colors(channel=0, colors={0: (9, 9, 9), 2: (8, 8, 8)})
+
+    assert device.led_data[0][3:6] == bytearray([2, 1, 3])
+    assert device.led_data[0][6:9] == bytearray([8, 8, 8])
+
+
+def test_set_colors_single_update_uses_report_5(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_colors(channel=1, colors={60: (1, 2, 3)})
+
+    assert device.writes == 1
+    assert device.led_data_channel == 0
+    assert device.led_data[1][180:183] == bytearray([2, 1, 3])
+
+
+def test_get_color_served_from_shadow(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_color(channel=0, index=4, red=10, green=20, blue=30)
+    reads = device.reads
+
+    assert stick.get_color(index=4) == [10, 20, 30]
+    assert stick.get_color(index=4, color_format='hex') == '#0a141e'
+    assert device.reads == reads
+
+
+def test_get_color_reads_unknown_leds_once(simulated_stick):
+    stick, device = simulated_stick()
+    device.led_data[0][0:3] = bytearray([2, 1, 3])
+
+    assert stick.get_color() == [1, 2, 3]
+    assert stick.get_color() == [1, 2, 3]
+    assert device.reads == 1
+
+
+def test_refresh_reads_back_device(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_led_data(0, [1, 2, 3, 4, 5, 6])
+    device.led_data[0][3:6] = bytearray([7, 8, 9])
+
+    assert list(stick.get_led_data(6)) == [1, 2, 3, 4, 5, 6]
+
+    stick.refresh(count=2)
+
+    assert list(stick.get_led_data(6)) == [1, 2, 3, 7, 8, 9]
+
+
+def test_get_color_reads_other_channels_once(simulated_stick):
+    stick, device = simulated_stick()
+    device.led_data_channel = 1
+    device.led_data[1][0:6] = bytearray([2, 1, 3, 5, 4, 6])
+
+    assert stick.get_color(index=1, channel=1) == [4, 5, 6]
+    assert stick.get_color(index=0, channel=1) == [1, 2, 3]
+    assert device.reads == 1
+
+    device.led_data_channel = 2
+    device.led_data[2][0:3] = bytearray([8, 7, 9])
+    stick.refresh(channel=2, count=1)
+
+    assert stick.get_color(index=0, channel=2) == [7, 8, 9]
+    assert device.reads == 2
+
+
+def test_morph_on_unreadable_channel_starts_from_black(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_led_data(2, [1, 2, 3] * 8)
+
+    stick.morph(channel=1, index=2, name="red", duration=10, steps=2)
+    stick.morph(channel=0, index=9, name="blue", duration=10, steps=2)
+
+    assert device.led_data[1][6:9] == bytearray([0, 255, 0])
+    assert device.led_data[0][27:30] == bytearray([0, 0, 255])
+    assert stick.get_color(index=3, channel=1) == [0, 0, 0]
+
+
+def test_refresh_rejects_data_of_another_channel(simulated_stick):
+    stick, device = simulated_stick()
+    device.led_data_channel = 1
+
+    with pytest.raises(BlinkStickException):
+        stick.refresh(channel=2, count=2)
+
+
+def test_skip_redundant_writes(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_skip_redundant_writes(True)
+
+    stick.set_color(index=1, red=255)
+    stick.set_color(index=1, red=255)
+    stick.set_color(index=1, red=255, force=True)
+
+    assert device.writes == 2
+    assert stick.get_write_counters() == {"sent": 2, "skipped": 1, "dropped": 0}
+
+
+def test_skip_redundant_writes_after_overlapping_frame(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_skip_redundant_writes(True)
+
+    stick.set_color(index=1, red=255)
+    stick.set_led_data(0, [0] * 6)
+    stick.set_color(index=1, red=255)
+
+    assert device.led_data[0][3:6] == bytearray([0, 255, 0])
+    assert stick.get_write_counters()["skipped"] == 0
+
+
+def test_set_led_data_accepts_buffers(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_led_data(1, array('B', [1, 2, 3] * 10))
+    stick.set_led_data(2, memoryview(bytes([4, 5, 6])))
+    stick.set_led_data(2, bytearray([7, 8, 9]))
+
+    assert device.led_data[1][0:33] == bytearray([1, 2, 3] * 10 + [0, 0, 0])
+    assert device.led_data[2][0:6] == bytearray([7, 8, 9, 0, 0, 0])
+    assert stick.get_led_data(3, channel=2) == bytearray([7, 8, 9])
+
+
+def test_set_led_data_converts_wide_items(simulated_stick):
+    stick, device = simulated_stick()
+
+    stick.set_led_data(0, array('H', [10, 20, 30]))
+    assert device.led_data[0][0:6] == bytearray([10, 20, 30, 0, 0, 0])
+
+    with pytest.raises(ValueError):
+        stick.set_led_data(0, array('H', [256]))
+
+
+def test_set_led_data_converts_numpy_arrays(simulated_stick):
+    numpy = pytest.importorskip("numpy")
+    stick, device = simulated_stick()
+
+    stick.set_led_data(0, numpy.array([10, 20, 30]))
+    stick.set_led_data(1, numpy.array([[1, 2, 3], [4, 5, 6]], dtype=numpy.int32))
+
+    assert device.led_data[0][0:6] == bytearray([10, 20, 30, 0, 0, 0])
+    assert device.led_data[1][0:6] == bytearray([1, 2, 3, 4, 5, 6])
+
+
+def test_circuit_breaker_fails_fast_and_recovers(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_reconnect_policy(ReconnectPolicy(failure_threshold=2, probe_interval=0.01, drop_writes=True))
+    device.connected = False
+
+    for i in range(0, 2):
+        with pytest.raises(BlinkStickException):
+            stick.set_color(red=255)
+
+    assert stick.circuit_breaker.is_open()
+    stick.set_color(red=255)
+
+    with pytest.raises(BlinkStickException):
+        stick.get_description()
+
+    device.connected = True
+    for i in range(0, 100):
+        if not stick.circuit_breaker.is_open():
+            break
+        time.sleep(0.01)
+
+    assert not stick.circuit_breaker.is_open()
+    stick.set_color(red=255)
+    assert device.led_data[0][0:3] == bytearray([0, 255, 0])
+
+
+def test_dropped_writes_are_counted_and_not_kept(simulated_stick):
+    stick, device = simulated_stick()
+    stick.enable_metrics()
+    stick.set_skip_redundant_writes(True)
+    stick.set_reconnect_policy(ReconnectPolicy(failure_threshold=1, probe_interval=10, drop_writes=True))
+    stick.set_color(red=10)
+
+    device.connected = False
+    with pytest.raises(BlinkStickException):
+        stick.set_color(red=20)
+
+    stick.set_color(blue=255)
+    stick.set_led_data(1, [1, 2, 3])
+
+    assert stick.get_color() == [10, 0, 0]
+    assert stick.get_write_counters() == {"sent": 1, "skipped": 0, "dropped": 2}
+    assert stick.get_metrics()["writes_dropped"] == 2
+
+    stick.circuit_breaker.close()
+    device.connected = True
+    stick.set_color(blue=255)
+
+    assert device.led_data[0][0:3] == bytearray([0, 0, 255])
+
+
+def test_reconnect_policy_is_per_device(simulated_stick):
+    stick, device = simulated_stick()
+    other, other_device = simulated_stick()
+
+    stick.get_reconnect_policy().retries = 5
+
+    assert other.get_reconnect_policy().retries == 1
+
+
+def test_metrics(simulated_stick):
+    stick, device = simulated_stick()
+    assert stick.get_metrics() is None
+
+    stick.enable_metrics()
+    stick.set_color(red=255)
+    stick.set_led_data(1, [0] * 30)
+    stick.get_mode()
+    stick.set_error_reporting(False)
+    device.connected = False
+    stick.set_color(red=255)
+
+    metrics = stick.get_metrics()
+    assert metrics["transfers"] == {4: 1, 5: 1, 7: 1}
+    assert metrics["bytes_sent"] == 6 + 50
+    assert metrics["bytes_received"] == 2
+    assert metrics["retries"] == 1
+    assert metrics["errors"] == 1
+    assert metrics["errors_swallowed"] == 1
+    assert sum(count for bound, count in metrics["latency"][5]) == 1
+
+    stick.reset_metrics()
+    assert stick.get_metrics()["transfers"] == {}
+
+
+def test_morph_honours_duration_on_slow_transfers(simulated_stick):
+    stick, device = simulated_stick(latency=0.01)
+    stick.set_color(red=0, green=0, blue=0)
+
+    start = time.monotonic()
+    stick.morph(red=255, duration=200, steps=50)
+    elapsed = time.monotonic() - start
+
+    # 50 transfers of 10ms would add 0.5s if the latency added up
+    assert 0.2 <= elapsed < 0.4
+    assert device.led_data[0][0:3] == bytearray([0, 255, 0])
+
+
+def test_pulse_repeats_share_one_schedule(simulated_stick):
+    stick, device = simulated_stick(latency=0.01)
+
+    start = time.monotonic()
+    stick.pulse(red=255, repeats=3, duration=100, steps=20)
+    elapsed = time.monotonic() - start
+
+    assert 0.6 <= elapsed < 0.9
+    assert device.led_data[0][0:3] == bytearray([0, 0, 0])
+
+
+def test_morph_clamps_start_color(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_max_rgb_value(100)
+    # written without the limit, for example by another program
+    device.led_data[0][0:3] = bytearray([200, 50, 0])
+
+    animation, start, end = stick._prepare_morph(0, 0, 0, 0, 255, None, None, 1000, 50)
+
+    assert start == [blinkstick_remap(50, 0, 100, 0, 255), 255, 0]
+
+
+def test_morph_led_data_sends_one_frame_per_step(simulated_stick):
+    stick, device = simulated_stick()
+    stick.set_led_data(0, [0, 0, 0] * 8)
+
+    stick.morph_led_data(0, [10, 20, 30] * 8, duration=10, steps=5)
+
+    assert stick.writes_sent == 6
+    assert device.led_data[0][0:24] == bytearray([10, 20, 30] * 8)
+
+
+def test_color_resolution_matches_remap(simulated_stick):
+    stick, device = simulated_stick()
+
+    for max_value in (255, 100, 7):
+        stick.max_rgb_value = max_value
+
+        for value in (0, 1, 127.5, 200, 255, 300):
+            expected = blinkstick_remap(value, 0, 255, 0, max_value)
+            assert stick._determine_rgb(red=value, green=value, blue=value) == (expected, expected, expected)
+
+    stick.max_rgb_value = 255
+    assert stick._determine_rgb(hexadecimal='#FF3366') == (255, 51, 102)
+    assert stick._determine_rgb(hexadecimal='#f36') == (255, 51, 102)
+    assert stick._determine_rgb(name='GoldenRod') == (218, 165, 32)
+    assert stick._determine_rgb(name='nocolor') == (0, 0, 0)
+    assert stick._determine_rgb(hexadecimal='#12') == (0, 0, 0)
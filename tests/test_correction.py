@@ -0,0 +1,45 @@
+from blinkstick.blinkstick import BlinkStick
+from blinkstick.correction import ColorCorrection
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
+
+
+def test_default_correction_is_identity():
+    correction = ColorCorrection()
+
+    report = bytearray([0, 1]) + bytearray(range(24))
+
+    assert correction.red_table == bytes(range(256))
+    assert correction.correct_report(report) == report
+
+
+def test_tables_combine_brightness_gamma_white_balance_and_inverse():
+    correction = ColorCorrection(brightness=128, gamma=(1.0, 2.0, 1.0), white_balance=(1.0, 1.0, 0.5), inverse=True)
+
+    assert correction.correct_rgb(255, 255, 255) == (255 - 128, 255 - 128, 255 - 64)
+    assert correction.correct_rgb(0, 0, 0) == (255, 255, 255)
+    assert correction.green_table[128] == 255 - int(round(128 * (128 / 255.0) ** 2))
+
+
+def test_correction_applied_at_send_time():
+    device = SimulatedDevice(mode=2)
+    stick = BlinkStick(transport=SimulatedTransport(device))
+    stick.set_color_correction(ColorCorrection(white_balance=(1.0, 0.5, 0.0)))
+
+    stick.set_led_data(0, [200, 100, 50] * 8)
+    stick.set_color(channel=1, index=2, red=100, green=200, blue=50)
+
+    assert device.led_data[0][0:3] == bytearray([100, 100, 0])
+    assert device.led_data[1][6:9] == bytearray([100, 100, 0])
+    assert stick.get_led_data(3) == bytearray([200, 100, 50])
+    assert stick.get_color(channel=1, index=2) == [100, 200, 50]
+
+
+def test_correct_report_reuses_buffer():
+    correction = ColorCorrection(white_balance=(1.0, 0.5, 0.0))
+
+    first = correction.correct_report(bytearray([0, 1, 200, 100, 50]))
+    assert first == bytearray([0, 1, 100, 100, 0])
+
+    second = correction.correct_report(bytearray([0, 2, 100, 200, 50]))
+    assert second is first
+    assert second == bytearray([0, 2, 50, 200, 0])
@@ -0,0 +1,64 @@
+from blinkstick.blinkstick import BlinkStick
+from blinkstick.group import DeviceGroup
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
+
+import time
+
+
+def _simulated_group(count, latency=0.0):
+    devices = [SimulatedDevice(serial="BS00000{0}-3.0".format(i), latency=latency) for i in range(count)]
+    sticks = [BlinkStick(transport=SimulatedTransport(device)) for device in devices]
+    return DeviceGroup(sticks), devices
+
+
+def test_commands_run_in_parallel():
+    latency = 0.1
+    group, devices = _simulated_group(4, latency=latency)
+
+    start = time.monotonic()
+    result = group.set_color(red=255)
+    elapsed = time.monotonic() - start
+
+    assert result.ok
+    # sending to one device after the other would take the sum of the latencies
+    assert elapsed < len(devices) * latency / 2
+    assert all(device.led_data[0][0:3] == bytearray([0, 255, 0]) for device in devices)
+    group.close()
+
+
+def test_errors_are_collected_per_device():
+    group, devices = _simulated_group(3)
+    devices[1].connected = False
+
+    result = group.set_color(name="blue")
+
+    assert not result.ok
+    assert list(result.errors) == [1]
+    assert sorted(result.results) == [0, 2]
+    assert devices[2].led_data[0][0:3] == bytearray([0, 0, 255])
+    group.close()
+
+
+def test_lazy_devices_are_not_opened_by_the_group():
+    devices = [SimulatedDevice(serial="BS000000-3.0") for i in range(2)]
+    sticks = [BlinkStick(transport=SimulatedTransport(device), lazy=True) for device in devices]
+
+    group = DeviceGroup(sticks)
+
+    assert not any(stick._opened for stick in sticks)
+
+    result = group.turn_off()
+
+    assert result.ok
+    assert sorted(result.results) == [0, 1]
+    group.close()
+
+
+def test_commands_accept_positional_arguments():
+    group, devices = _simulated_group(2)
+
+    result = group.set_color(0, 1, 0, 0, 255)
+
+    assert result.ok
+    assert all(device.led_data[0][3:6] == bytearray([0, 0, 255]) for device in devices)
+    group.close()
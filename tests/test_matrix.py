@@ -0,0 +1,198 @@
+from blinkstick.exception import BlinkStickException
+from blinkstick.font import FONT_3X5
+from blinkstick.layout import PanelLayout
+from blinkstick.pro_matrix import BlinkStickProMatrix
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
+
+import pytest
+import random
+
+
+def _random_matrix(columns=5, rows=4, seed=0):
+    values = random.Random(seed)
+    matrix = BlinkStickProMatrix(r_columns=columns, r_rows=rows, delay=0)
+    for y in range(rows):
+        for x in range(columns):
+            matrix.set_color(x, y, values.randint(0, 255), values.randint(0, 255), values.randint(0, 255))
+    return matrix
+
+
+def _pixels(matrix):
+    return dict(((x, y), matrix.get_color(x, y)) for y in range(matrix.rows) for x in range(matrix.cols))
+
+
+def test_scroll_moves_pixels():
+    for dx, dy in ((1, 0), (-2, 0), (0, 1), (0, -3), (2, -1), (-7, 9)):
+        for wrap in (False, True):
+            matrix = _random_matrix()
+            before = _pixels(matrix)
+
+            matrix.scroll(dx, dy, wrap=wrap)
+
+            for (x, y), color in _pixels(matrix).items():
+                source = (x - dx, y - dy)
+                if wrap:
+                    source = (source[0] % matrix.cols, source[1] % matrix.rows)
+                assert color == before.get(source, [0, 0, 0])
+
+
+def test_shifts_wrap_unless_removed():
+    matrix = _random_matrix()
+    before = _pixels(matrix)
+
+    matrix.shift_left()
+    assert matrix.get_color(4, 2) == before[(0, 2)]
+
+    matrix.shift_up(remove=True)
+    assert matrix.get_color(1, 0) == before[(2, 1)]
+    assert matrix.get_color(1, 3) == [0, 0, 0]
+
+
+def test_matrix_columns_are_sent_to_their_channels():
+    device = SimulatedDevice(mode=2)
+    matrix = BlinkStickProMatrix(r_columns=2, r_rows=2, g_columns=2, g_rows=2, delay=0)
+    matrix.connect(transport=SimulatedTransport(device))
+
+    matrix.set_color(1, 1, 1, 2, 3)
+    matrix.set_color(2, 0, 4, 5, 6)
+    matrix.send_data_all()
+
+    assert device.led_data[0][9:12] == bytearray([2, 1, 3])
+    assert device.led_data[1][0:3] == bytearray([5, 4, 6])
+
+
+def _wired_colors(matrix, channel=0):
+    data = matrix._channel_data(channel)
+    return [data[i + 1] for i in range(0, len(data), 3)]
+
+
+def _numbered_matrix(layouts, columns=3, rows=2):
+    matrix = BlinkStickProMatrix(r_columns=columns, r_rows=rows, delay=0, layouts=layouts)
+    for y in range(rows):
+        for x in range(columns):
+            matrix.set_color(x, y, y * 10 + x, 0, 0)
+    return matrix
+
+
+def test_layouts_map_wiring_to_matrix():
+    assert _wired_colors(_numbered_matrix(None)) == [0, 1, 2, 10, 11, 12]
+    assert _wired_colors(_numbered_matrix({0: PanelLayout(serpentine=True)})) == [0, 1, 2, 12, 11, 10]
+    assert _wired_colors(_numbered_matrix({0: PanelLayout(rotation=180)})) == [12, 11, 10, 2, 1, 0]
+    assert _wired_colors(_numbered_matrix({0: PanelLayout(flip_x=True)})) == [2, 1, 0, 12, 11, 10]
+    assert _wired_colors(_numbered_matrix({0: PanelLayout(rotation=90)})) == [2, 12, 1, 11, 0, 10]
+    assert _wired_colors(_numbered_matrix({0: PanelLayout(rotation=270)})) == [10, 0, 11, 1, 12, 2]
+
+
+def test_chained_panels():
+    layouts = {0: [PanelLayout(columns=2, rows=2, x=2), PanelLayout(columns=2, rows=2, x=0, serpentine=True)]}
+    matrix = _numbered_matrix(layouts, columns=4)
+
+    assert _wired_colors(matrix) == [2, 3, 12, 13, 0, 1, 11, 10]
+
+    with pytest.raises(BlinkStickException):
+        matrix.set_layout(0, PanelLayout(columns=2, rows=2))
+
+
+def test_blit_clips_and_converts_to_grb():
+    matrix = BlinkStickProMatrix(r_columns=4, r_rows=3, delay=0, max_rgb=127)
+    image = bytes([1, 2, 3, 255, 0, 0,
+                   4, 5, 6, 0, 0, 255])
+
+    matrix.blit(image, x=3, y=2, width=2)
+
+    assert matrix.get_color(3, 2) == [0, 0, 1]
+    assert matrix.get_color(2, 2) == [0, 0, 0]
+    assert bytes(matrix.matrix_data).count(0) == 4 * 3 * 3 - 1
+
+    matrix.blit(image, x=-1, y=0, width=2, key=(255, 0, 0), remap_values=False)
+    assert matrix.get_color(0, 0) == [0, 0, 0]
+    assert matrix.get_color(0, 1) == [0, 0, 255]
+
+
+def test_load_frame_replaces_whole_matrix():
+    matrix = BlinkStickProMatrix(r_columns=2, r_rows=2, delay=0)
+
+    matrix.load_frame(bytearray(range(12)))
+
+    assert matrix.matrix_data == bytearray([1, 0, 2, 4, 3, 5, 7, 6, 8, 10, 9, 11])
+    assert matrix.get_color(1, 1) == [9, 10, 11]
+
+
+def test_blit_accepts_numpy_crop():
+    numpy = pytest.importorskip("numpy")
+    matrix = BlinkStickProMatrix(r_columns=2, r_rows=2, delay=0)
+    image = numpy.arange(2 * 3 * 3, dtype=numpy.uint8).reshape(2, 3, 3)
+
+    matrix.blit(image[:, :2])
+
+    assert matrix.get_color(1, 0) == [3, 4, 5]
+    assert matrix.get_color(0, 1) == [9, 10, 11]
+
+    matrix.load_frame(image[:, 1:])
+
+    assert matrix.get_color(0, 0) == [3, 4, 5]
+    assert matrix.get_color(1, 1) == [15, 16, 17]
+
+
+def _lit(matrix):
+    return [''.join('#' if matrix.get_color(x, y) != [0, 0, 0] else '.' for x in range(matrix.cols))
+            for y in range(matrix.rows)]
+
+
+def test_number_draws_3x5_glyph():
+    matrix = BlinkStickProMatrix(r_columns=4, r_rows=5, delay=0)
+
+    matrix.number(1, 0, 4, 255, 0, 0)
+
+    assert _lit(matrix) == ['.#.#', '.#.#', '.###', '...#', '...#']
+
+
+def test_draw_text_clips_to_matrix():
+    matrix = BlinkStickProMatrix(r_columns=6, r_rows=4, delay=0)
+
+    assert matrix.draw_text(-2, 1, "AB", 0, 0, 255) == 7
+
+    assert _lit(matrix) == ['......', '..##..', '#.#.#.', '#.##..']
+    assert matrix.get_color(0, 2) == [0, 0, 255]
+
+
+def test_scroll_text_moves_one_column_per_step():
+    matrix = BlinkStickProMatrix(r_columns=4, r_rows=5, delay=0)
+    steps = matrix.scroll_text("1", 255, 255, 255, font=FONT_3X5)
+
+    for i in range(3):
+        next(steps)
+    assert _lit(matrix) == ['..#.', '.##.', '..#.', '..#.', '.###']
+
+    assert len(list(steps)) == 4
+    assert _lit(matrix) == ['....'] * 5
+
+
+def test_primitives_write_clipped_shapes():
+    matrix = BlinkStickProMatrix(r_columns=5, r_rows=5, delay=0)
+
+    matrix.fill_rect(3, 3, 9, 9, 255, 0, 0)
+    matrix.hline(-1, 1, 0, 255, 0, 0)
+    matrix.vline(4, -3, 1, 255, 0, 0)
+    assert _lit(matrix) == ['##..#', '....#', '.....', '...##', '...##']
+
+    matrix.fill(0, 0, 0)
+    matrix.rectangle(0, 0, 4, 2, 255, 0, 0)
+    assert _lit(matrix) == ['#####', '#...#', '#####', '.....', '.....']
+
+    matrix.clear()
+    matrix.circle(2, 2, 2, 255, 0, 0)
+    assert _lit(matrix) == ['.###.', '#...#', '#...#', '#...#', '.###.']
+
+    matrix.fill_circle(2, 2, 1, 0, 0, 255)
+    assert _lit(matrix) == ['.###.', '#.#.#', '#####', '#.#.#', '.###.']
+    assert matrix.get_color(2, 2) == [0, 0, 255]
+
+
+def test_line_without_points():
+    matrix = BlinkStickProMatrix(r_columns=4, r_rows=4, delay=0)
+
+    assert matrix.line(3, 0, 0, 3, 255, 0, 0) == [(3, 0), (2, 1), (1, 2), (0, 3)]
+    matrix.clear()
+    assert matrix.line(0, 0, 3, 3, 255, 0, 0, collect_points=False) is None
+    assert _lit(matrix) == ['#...', '.#..', '..#.', '...#']
@@ -0,0 +1,20 @@
+from blinkstick.pacer import FramePacer
+
+
+def test_waits_only_for_rest_of_slot():
+    pacer = FramePacer(fps=50, channels=2)
+
+    assert abs(pacer.get_delay(start=0.0, now=0.004) - 0.006) < 1e-9
+    assert abs(pacer.get_delay(start=0.010, now=0.012) - 0.008) < 1e-9
+    assert pacer.missed_deadlines == 0
+
+
+def test_missed_deadline_restarts_schedule():
+    pacer = FramePacer(fps=100)
+
+    assert pacer.get_delay(start=0.0, now=0.015) == 0.0
+    assert abs(pacer.get_delay(start=0.015, now=0.016) - 0.009) < 1e-9
+
+    stats = pacer.get_stats()
+    assert stats["missed_deadlines"] == 1
+    assert abs(stats["max_lateness"] - 0.005) < 1e-9
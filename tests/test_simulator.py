@@ -0,0 +1,130 @@
+from blinkstick.blinkstick import BlinkStick
+from blinkstick.pro import BlinkStickPro
+from blinkstick.simulator import SimulatedDevice, SimulatedTransport
+
+import time
+
+
+def test_descriptors():
+    stick = BlinkStick(transport=SimulatedTransport(serial="BS000001-3.0"))
+
+    assert stick.get_serial() == "BS000001-3.0"
+    assert stick.get_manufacturer() == "Agile Innovative Ltd"
+    assert stick.get_description() == "BlinkStick"
+
+
+def test_set_color_updates_led_ram():
+    device = SimulatedDevice()
+    stick = BlinkStick(transport=SimulatedTransport(device))
+
+    stick.set_color(channel=1, index=2, red=10, green=20, blue=30)
+
+    assert device.led_data[1][6:9] == bytearray([20, 10, 30])
+
+
+def test_mode_and_led_count():
+    stick = BlinkStick(transport=SimulatedTransport())
+
+    stick.set_mode(2)
+    stick.set_led_count(8)
+
+    assert stick.get_mode() == 2
+    assert stick.get_led_count() == 8
+
+
+def test_info_blocks():
+    stick = BlinkStick(transport=SimulatedTransport())
+
+    stick.set_info_block1("kitchen")
+
+    assert stick.get_info_block1() == "kitchen"
+    assert stick.get_info_block2() == ""
+
+
+def test_pro_send_data():
+    device = SimulatedDevice(mode=2)
+    pro = BlinkStickPro(r_led_count=10, delay=0)
+    pro.connect(transport=SimulatedTransport(device))
+
+    pro.set_color(0, 9, 1, 2, 3)
+    pro.send_data_all()
+
+    assert device.led_data_channel == 0
+    assert device.led_data[0][27:30] == bytearray([2, 1, 3])
+
+
+def test_pro_skip_redundant_writes():
+    device = SimulatedDevice(mode=2)
+    pro = BlinkStickPro(r_led_count=10, delay=0)
+    pro.set_skip_redundant_writes(True)
+    pro.connect(transport=SimulatedTransport(device))
+
+    pro.set_color(0, 0, 255, 0, 0)
+    pro.send_data_all()
+    pro.send_data_all()
+
+    assert device.writes == 1
+    assert pro.get_write_counters() == {"sent": 1, "skipped": 1, "dropped": 0}
+
+
+def test_string_descriptors_are_read_once():
+    transport = SimulatedTransport()
+    stick = BlinkStick(transport=transport)
+    calls = []
+    read_string = transport.read_string
+    transport.read_string = lambda index: calls.append(index) or read_string(index)
+
+    stick.get_serial()
+    stick.get_manufacturer()
+    stick.get_manufacturer()
+
+    assert calls == [1]
+
+
+def test_lazy_construction():
+    device = SimulatedDevice(serial="BS000002-3.0")
+    stick = BlinkStick(transport=SimulatedTransport(device), lazy=True)
+
+    device.serial = "BS000003-3.0"
+
+    assert stick.bs_serial == "BS000003-3.0"
+
+
+def test_pro_pipelined_send_waits_once_per_frame():
+    delay = 0.2
+    device = SimulatedDevice(mode=2)
+    pro = BlinkStickPro(r_led_count=8, g_led_count=8, b_led_count=8, delay=delay)
+    pro.set_pipelined(True)
+    pro.connect(transport=SimulatedTransport(device))
+
+    pro.set_color(2, 7, 1, 2, 3)
+
+    start = time.monotonic()
+    pro.send_data_all()
+    elapsed = time.monotonic() - start
+
+    # waiting after each of the 3 channels would take 3 delays
+    assert delay <= elapsed < 2 * delay
+    assert device.writes == 3
+    assert device.led_data[2][21:24] == bytearray([2, 1, 3])
+
+    timing = pro.get_frame_timing()
+    assert sorted(timing["channels"]) == [0, 1, 2]
+    assert timing["channels"][0]["offset"] <= timing["skew"] <= timing["duration"]
+
+
+def test_pro_buffer_is_sent_in_wire_order():
+    device = SimulatedDevice(mode=2)
+    pro = BlinkStickPro(r_led_count=4, delay=0)
+    pro.connect(transport=SimulatedTransport(device))
+
+    pro.set_color(0, 0, 1, 2, 3)
+    pro.get_buffer(0)[9:12] = bytes([4, 5, 6])
+    pro.send_data(0)
+
+    assert pro.data[0] == bytearray([2, 1, 3, 0, 0, 0, 0, 0, 0, 4, 5, 6])
+    assert pro.get_color(0, 3) == [5, 4, 6]
+    assert device.led_data[0][0:12] == pro.data[0]
+
+    pro.clear()
+    assert pro.data[0] == bytearray(12)
@@ -0,0 +1,50 @@
+from blinkstick.transition import transition_frames
+
+import pytest
+import types
+
+
+def test_frames_are_generated_lazily():
+    frames = transition_frames([0, 0, 0], [255, 255, 255], 1000000)
+
+    assert isinstance(frames, types.GeneratorType)
+    assert bytes(next(frames)) == bytes([0, 0, 0])
+
+
+def test_interpolates_all_leds():
+    start = [[0, 0, 0], [255, 100, 10]]
+    end = [[100, 200, 255], [0, 100, 20]]
+
+    frames = [bytes(frame) for frame in transition_frames(start, end, 4, use_numpy=False)]
+
+    assert len(frames) == 4
+    assert frames[1] == bytes([50, 100, 128, 128, 100, 15])
+    assert frames[-1] == bytes([100, 200, 255, 0, 100, 20])
+
+
+def test_numpy_frames_match_python_frames_for_buffers():
+    pytest.importorskip("numpy")
+
+    start = bytes([0, 255, 10, 200, 7, 99])
+    end = bytearray([255, 0, 20, 100, 8, 0])
+
+    numpy_frames = [bytes(frame) for frame in transition_frames(start, end, 7, use_numpy=True)]
+    python_frames = [bytes(frame) for frame in transition_frames(start, end, 7, use_numpy=False)]
+
+    assert numpy_frames == python_frames
+    assert numpy_frames[-1] == bytes(end)
+
+
+@pytest.mark.parametrize("dtype", ["int64", "uint8"])
+def test_numpy_led_arrays_are_flattened(dtype):
+    numpy = pytest.importorskip("numpy")
+
+    start = numpy.zeros((4, 3), dtype=dtype)
+    end = numpy.full((4, 3), 200, dtype=dtype)
+    end[1] = (10, 20, 30)
+
+    for use_numpy in (True, False):
+        frames = [bytes(frame) for frame in transition_frames(start, end, 2, use_numpy=use_numpy)]
+
+        assert frames == [bytes([100] * 3 + [5, 10, 15] + [100] * 6),
+                          bytes([200] * 3 + [10, 20, 30] + [200] * 6)]
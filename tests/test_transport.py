@@ -0,0 +1,98 @@
+from blinkstick import transport
+from blinkstick.transport import DeviceRegistry, device_location
+
+import pytest
+
+
+class _Device(object):
+    def __init__(self, serial, bus, port):
+        self.serial = serial
+        self.bus = bus
+        self.address = port
+        self.port_numbers = [port]
+
+
+class _Transport(object):
+    def __init__(self, device, opened):
+        self.device = device
+        self.opened = opened
+
+    def get_string(self, index):
+        self.opened.append(self.device.serial)
+        return self.device.serial
+
+
+@pytest.fixture
+def attached(monkeypatch):
+    devices = []
+    opened = []
+
+    def find_device_by_location(location):
+        for d in devices:
+            if device_location(d) == location:
+                return d
+
+    monkeypatch.setattr(transport, "find_devices", lambda find_all=True: list(devices))
+    monkeypatch.setattr(transport, "find_device_by_location", find_device_by_location)
+    monkeypatch.setattr(transport, "create_transport", lambda device: _Transport(device, opened))
+
+    return devices, opened
+
+
+def test_register_and_forget():
+    registry = DeviceRegistry()
+
+    registry.register("BS000001-3.0", (1, (2,)))
+    registry.register("BS000002-3.0", None)
+    registry.register(None, (1, (3,)))
+
+    assert registry.get_location("BS000001-3.0") == (1, (2,))
+    assert registry.get_location("BS000002-3.0") is None
+
+    registry.forget("BS000001-3.0")
+    registry.forget("BS000003-3.0")
+
+    assert registry.get_location("BS000001-3.0") is None
+
+
+def test_find_at_known_location_skips_scan(attached):
+    devices, opened = attached
+    devices.extend([_Device("BS000001-3.0", 1, 1), _Device("BS000002-3.0", 1, 2)])
+    registry = DeviceRegistry()
+    registry.register("BS000002-3.0", (1, (2,)))
+
+    assert registry.find("BS000002-3.0") is devices[1]
+    assert opened == ["BS000002-3.0"]
+
+
+def test_find_falls_back_to_scan_when_device_moved(attached):
+    devices, opened = attached
+    devices.extend([_Device("BS000001-3.0", 1, 1), _Device("BS000002-3.0", 1, 4)])
+    registry = DeviceRegistry()
+    registry.register("BS000002-3.0", (1, (2,)))
+
+    assert registry.find("BS000002-3.0") is devices[1]
+    assert opened == ["BS000001-3.0", "BS000002-3.0"]
+    assert registry.get_location("BS000001-3.0") == (1, (1,))
+    assert registry.get_location("BS000002-3.0") == (1, (4,))
+
+
+def test_find_falls_back_to_scan_when_other_device_at_location(attached):
+    devices, opened = attached
+    devices.extend([_Device("BS000001-3.0", 1, 2), _Device("BS000002-3.0", 1, 3)])
+    registry = DeviceRegistry()
+    registry.register("BS000002-3.0", (1, (2,)))
+
+    assert registry.find("BS000002-3.0") is devices[1]
+    assert registry.get_location("BS000002-3.0") == (1, (3,))
+
+
+def test_find_unplugged_device(attached):
+    devices, opened = attached
+    devices.append(_Device("BS000001-3.0", 1, 1))
+    registry = DeviceRegistry()
+    registry.register("BS000002-3.0", (1, (2,)))
+
+    assert registry.find("BS000002-3.0") is None
+    assert registry.get_location("BS000002-3.0") is None
+    assert registry.get_location("BS000001-3.0") == (1, (1,))
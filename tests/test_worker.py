@@ -0,0 +1,41 @@
+def test_frames_for_same_channel_are_coalesced(simulated_stick):
+    stick, device = simulated_stick(latency=0.05)
+    worker = stick.start_output_thread()
+
+    for value in range(0, 20):
+        stick.set_led_data(0, [value] * 24)
+
+    stick.stop_output_thread()
+
+    assert device.led_data[0][0:24] == bytearray([19] * 24)
+    assert device.writes < 20
+    assert worker.sent + worker.coalesced == 20
+
+
+def test_colors_merge_into_queued_frame(simulated_stick):
+    stick, device = simulated_stick(latency=0.05)
+    stick.start_output_thread()
+
+    stick.set_led_data(1, [0] * 24)
+    stick.set_led_data(1, [0] * 48)
+    stick.set_led_data(1, [9] * 24)
+    stick.set_color(channel=1, index=2, red=1, green=2, blue=3)
+    stick.flush()
+
+    assert device.led_data[1][0:6] == bytearray([9] * 6)
+    assert device.led_data[1][6:9] == bytearray([2, 1, 3])
+    assert device.led_data[1][24:48] == bytearray(24)
+
+    stick.stop_output_thread()
+
+
+def test_reads_wait_for_pending_writes(simulated_stick):
+    stick, device = simulated_stick(latency=0.01)
+    stick.start_output_thread()
+
+    stick.set_mode(1)
+    stick.set_mode(3)
+
+    assert stick.get_mode() == 3
+
+    stick.stop_output_thread()